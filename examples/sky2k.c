@@ -34,33 +34,36 @@
 
 #define SP_NUM 180
 
+/* members ordered by alignment, widest first, so only the tail is padded */
 struct sky2kv4_object {
 	struct adb_object object;
-	unsigned char type;
-	char name[11];		/* Name or AGK3 number */
-	char sp[4];		/* One dimensional SP class */
-	int HD;		/* HD number */
-	int SAO;		/* SAO number */
-	int PPM;		/* PPM number */
 	double pmRA;		/* proper motion in RA */
 	double pmDEC;		/* proper motion in DEC */
 	double RV;		/* Radial velocity */
-
 	double sep;		/* separation between 1st and 2nd brightest */
-	float Dmag;		/* mag difference */
 	double orbPer;		/* orbital period - years */
-	short PA;		/* position angle */
 	double date;		/* observation date */
-	int ID_A;		/* primary component ID */
-	int ID_B;		/* primary component ID */
-	int ID_C;		/* primary component ID */
+	double varPer;		/* period of variability - days */
+	double varEpo;		/* epoch of variability */
 
+	float Dmag;		/* mag difference */
 	float magMax;		/* max variable mag */
 	float magMin;		/* min variable mag */
 	float varAmp;		/* variability magnitude */
-	double varPer;		/* period of variability - days */
-	double varEpo;		/* epoch of variability */
+
+	int HD;		/* HD number */
+	int SAO;		/* SAO number */
+	int PPM;		/* PPM number */
+	int ID_A;		/* primary component ID */
+	int ID_B;		/* primary component ID */
+	int ID_C;		/* primary component ID */
+
+	short PA;		/* position angle */
 	short varType;		/* type of variable star */
+
+	unsigned char type;
+	char name[11];		/* Name or AGK3 number */
+	char sp[4];		/* One dimensional SP class */
 };
 
 struct star_colour_data {
@@ -1,8 +1,77 @@
 from .lib import (
     libadb,
+    AstroDBError,
+    D2R,
+    R2D,
+    TWO_PI,
+    _adb_close_library,
+    _adb_create_db,
+    _adb_db_free,
+    _adb_get_version,
+    _adb_open_library,
+    _adb_search_add_box,
+    _adb_search_add_comparator,
+    _adb_search_add_cone,
+    _adb_search_add_custom_comparator,
+    _adb_search_add_operator,
+    _adb_search_add_terms,
+    _adb_search_free,
+    _adb_search_get_hits,
+    _adb_search_get_results,
+    _adb_search_get_results_packed,
+    _adb_search_get_tests,
+    _adb_search_new,
+    _adb_set_get_count,
+    _adb_set_get_head,
+    _adb_set_get_object,
+    _adb_set_get_objects,
+    _adb_set_get_trixels,
+    _adb_set_hash_key,
+    _adb_solution_divergence,
+    _adb_solution_equ_to_plate_position,
+    _adb_solution_get_objects,
+    _adb_solution_get_pixel_size,
+    _adb_solution_get_plate_equ_bounds,
+    _adb_solution_plate_to_equ_position,
+    _adb_solve,
+    _adb_solve_add_plate_object,
+    _adb_solve_constraint,
+    _adb_solve_free,
+    _adb_solve_get_solution,
+    _adb_solve_new,
+    _adb_solve_set_distance_delta,
+    _adb_solve_set_magnitude_delta,
+    _adb_solve_set_pa_delta,
+    _adb_table_close,
+    _adb_table_get_count,
+    _adb_table_get_field_offset,
+    _adb_table_get_field_type,
+    _adb_table_get_object,
+    _adb_table_get_object_size,
+    _adb_table_get_objects,
+    _adb_table_get_size,
+    _adb_table_hash_key,
+    _adb_table_import,
+    _adb_table_import_alt_dataset,
+    _adb_table_import_field,
+    _adb_table_import_new,
+    _adb_table_import_schema,
+    _adb_table_open,
+    _adb_table_set_constraints,
+    _adb_table_set_constraints_batch,
+    _adb_table_set_free,
+    _adb_table_set_get_nearest_on_pos,
+    _adb_table_set_new,
     adb_object,
     adb_object_p,
+    adb_object_head,
     adb_pobject,
+    adb_numpy_dtype,
+    adb_search_box,
+    adb_search_term,
+    adb_trixel_id,
+    AdbOp,
+    AdbComp,
     ADB_OP_AND,
     ADB_OP_OR,
     ADB_COMP_LT,
@@ -29,52 +98,99 @@ from .lib import (
     ADB_CTYPE_INT,
     ADB_CTYPE_FLOAT,
     ADB_CTYPE_DOUBLE,
-    ADB_CTYPE_STRING
+    ADB_CTYPE_STRING,
+    ADB_IMPORT_INC,
+    ADB_IMPORT_DEC,
+    adb_schema_field,
+    adb_set_member,
+    adb_set_gmember,
+    adb_offset,
+    adb_sizeof,
+    ADB_OBJECT_DTYPE,
 )
 
+import array
 import ctypes
+import functools
+import math
+import numbers
+import os
+import weakref
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+@functools.lru_cache(maxsize=1024)
+def _utf8(s) -> bytes:
+    """Encode a str (or os.PathLike) argument for C, bytes pass straight through.
+
+    Catalogue, table and field names repeat across calls so the result is
+    memoised rather than re-encoded every time.
+    """
+    s = os.fspath(s)
+    return s if isinstance(s, bytes) else s.encode('utf-8')
+
+class _Handle:
+    """Owns a C handle released by self._finalizer (a weakref.finalize).
+
+    Cleanup runs on close(), on leaving a with block, when the wrapper is
+    collected or at interpreter exit, whichever is first, and only once.
+    """
+    def close(self):
+        self._finalizer()
+        self._ptr = None
+
+    def __enter__(self):
+        return self
 
-class AstroDBError(Exception):
-    """Base exception for astrodb wrapper errors."""
-    pass
+    def __exit__(self, *exc):
+        self.close()
 
-class Library:
+def _table_close(db, table_id):
+    # the database may already have been closed, which frees its tables
+    if db._ptr:
+        _adb_table_close(db._ptr, table_id)
+
+def _doubles(values):
+    """(double *, owner) for a sequence of floats, the owner keeps the memory alive.
+
+    Contiguous float64 NumPy arrays are passed without a copy. Other
+    sequences are converted by array.array in one C loop and its buffer
+    is passed as is, rather than splatting them into a ctypes array.
+    """
+    if np is not None and isinstance(values, np.ndarray):
+        arr = np.ascontiguousarray(values, dtype=np.float64)
+        return arr.ctypes.data_as(ctypes.POINTER(ctypes.c_double)), arr
+    arr = array.array('d', values)
+    return ctypes.cast((ctypes.c_double * len(arr)).from_buffer(arr), ctypes.POINTER(ctypes.c_double)), arr
+
+class Library(_Handle):
     def __init__(self, host: str, remote: str, local: str):
-        self._ptr = libadb.adb_open_library(
-            host.encode('utf-8'),
-            remote.encode('utf-8'),
-            local.encode('utf-8')
+        self._ptr = _adb_open_library(
+            _utf8(host),
+            _utf8(remote),
+            _utf8(local)
         )
         if not self._ptr:
             raise AstroDBError("Failed to open library. Check paths and network.")
+        self._finalizer = weakref.finalize(self, _adb_close_library, self._ptr)
 
     @property
     def version(self) -> str:
-        v = libadb.adb_get_version()
+        v = _adb_get_version()
         return v.decode('utf-8') if v else "unknown"
 
-    def close(self):
-        if self._ptr:
-            libadb.adb_close_library(self._ptr)
-            self._ptr = None
 
-    def __del__(self):
-        self.close()
-
-class Database:
+class Database(_Handle):
     def __init__(self, lib: Library, depth: int, num_tables: int):
         self.lib = lib
-        self._ptr = libadb.adb_create_db(lib._ptr, depth, num_tables)
+        self._ptr = _adb_create_db(lib._ptr, depth, num_tables)
         if not self._ptr:
             raise AstroDBError("Failed to create database context.")
+        self._finalizer = weakref.finalize(self, _adb_db_free, self._ptr)
 
-    def close(self):
-        if self._ptr:
-            libadb.adb_db_free(self._ptr)
-            self._ptr = None
-
-    def __del__(self):
-        self.close()
 
 class AstroObject:
     def __init__(self, c_obj, table):
@@ -116,136 +232,245 @@ class AstroObject:
         addr = ctypes.addressof(self.c_obj) + offset
         return ctypes.cast(addr, ctypes.POINTER(ctypes.c_int)).contents.value
 
-class Table:
+    def as_struct(self, obj_type):
+        """Zero copy view of this object as its catalogue structure.
+
+        obj_type is e.g. the ctypes class passed to build_schema().
+        Catalogue fields are then plain attributes at fixed offsets,
+        obj.as_struct(sky2kv4_object).HD rather than obj.get_int("HD").
+        The view aliases the C object.
+        """
+        return obj_type.from_address(ctypes.addressof(self.c_obj))
+
+class Table(_Handle):
     def __init__(self, db: Database, cat_class: str, cat_id: str, table_name: str):
         self.db = db
-        self.table_id = libadb.adb_table_open(
+        self.table_id = _adb_table_open(
             db._ptr,
-            cat_class.encode('utf-8'),
-            cat_id.encode('utf-8'),
-            table_name.encode('utf-8')
+            _utf8(cat_class),
+            _utf8(cat_id),
+            _utf8(table_name)
         )
         self._kept_strings = []
-        if self.table_id < 0:
-            raise AstroDBError(f"Failed to open table {cat_class}/{cat_id} {table_name}")
+        self._count = None
+        self._offsets = {}
+        self._finalizer = weakref.finalize(self, _table_close, db, self.table_id)
 
     def __len__(self):
-        count = libadb.adb_table_get_count(self.db._ptr, self.table_id)
-        return count if count >= 0 else 0
+        # the count only changes on import, don't cross into C for every len()
+        if self._count is None:
+            count = _adb_table_get_count(self.db._ptr, self.table_id)
+            self._count = count if count >= 0 else 0
+        return self._count
+
+    def invalidate(self):
+        """Drop cached table state, e.g. after the C side changed the table."""
+        self._count = None
+        self._offsets = {}
 
     @property
     def size(self) -> int:
-        return libadb.adb_table_get_size(self.db._ptr, self.table_id)
+        return _adb_table_get_size(self.db._ptr, self.table_id)
 
     @property
     def object_size(self) -> int:
-        return libadb.adb_table_get_object_size(self.db._ptr, self.table_id)
+        return _adb_table_get_object_size(self.db._ptr, self.table_id)
+
+    def _objects_buffer(self):
+        objects = ctypes.c_void_p()
+        count = _adb_table_get_objects(self.db._ptr, self.table_id, ctypes.byref(objects))
+        return (ctypes.c_ubyte * (count * self.object_size)).from_address(objects.value), count
+
+    def objects_view(self) -> memoryview:
+        """Zero copy view of every loaded object.
+
+        The view is 2-D with one object_size row of bytes per object, so
+        len() is the object count and view[i, j] is byte j of object i.
+        It aliases the table's own object array and is only valid until
+        the table is closed.
+        """
+        buf, count = self._objects_buffer()
+        return memoryview(buf).cast('B', (count, self.object_size))
+
+    def numpy_view(self, obj_type=None):
+        """Zero copy structured array over every loaded object.
+
+        Rows are as ObjectSet.to_numpy(), in table (trixel) order. Like
+        objects_view() the array is only valid until the table is closed.
+        """
+        dtype = self._numpy_dtype(obj_type, strided=True)
+        return np.frombuffer(self._objects_buffer()[0], dtype=dtype)
+
+    def _numpy_dtype(self, obj_type, strided=False):
+        if np is None:
+            raise AstroDBError("numpy is required for structured object arrays")
+        if obj_type is None:
+            dtype = ADB_OBJECT_DTYPE
+        else:
+            dtype = adb_numpy_dtype(obj_type)
+            if dtype.itemsize != self.object_size:
+                raise AstroDBError(f"{obj_type.__name__} is {dtype.itemsize} bytes, "
+                                   f"table objects are {self.object_size}")
+        stride = self.object_size
+        if strided and dtype.itemsize != stride:
+            # view in place, pad each row out to the table object stride
+            dtype = np.dtype({'names': dtype.names,
+                              'formats': [dtype.fields[n][0] for n in dtype.names],
+                              'offsets': [dtype.fields[n][1] for n in dtype.names],
+                              'itemsize': stride})
+        return dtype
 
     def hash_key(self, key: str):
-        bkey = key.encode('utf-8')
+        bkey = _utf8(key)
         self._kept_strings.append(bkey)
-        res = libadb.adb_table_hash_key(self.db._ptr, self.table_id, bkey)
-        if res < 0:
-            raise AstroDBError(f"Failed to set hash key {key} for table.")
+        _adb_table_hash_key(self.db._ptr, self.table_id, bkey)
 
     def get_object(self, id_val, field: str):
         if isinstance(id_val, int):
             c_val = ctypes.c_int(id_val)
             ptr = ctypes.cast(ctypes.pointer(c_val), ctypes.c_void_p)
-        elif isinstance(id_val, str):
-            c_val = ctypes.create_string_buffer(id_val.encode('utf-8'))
+        elif isinstance(id_val, (str, bytes)):
+            c_val = ctypes.create_string_buffer(_utf8(id_val))
             ptr = ctypes.cast(c_val, ctypes.c_void_p)
         else:
             raise AstroDBError("id_val must be int or str")
         obj_ptr = adb_object_p()
-        res = libadb.adb_table_get_object(self.db._ptr, self.table_id, ptr, field.encode('utf-8'), ctypes.byref(obj_ptr))
-        if res < 0:
-            raise AstroDBError(f"Failed to get object with ID {id_val} on field {field}")
+        _adb_table_get_object(self.db._ptr, self.table_id, ptr, _utf8(field), ctypes.byref(obj_ptr))
         return obj_ptr.contents if obj_ptr else None
 
     # Import functionalities
-    def import_new(self, cat_class: str, cat_id: str, table_name: str, depth_field: str, min_limit: float, max_limit: float, otype: int):
-        res = libadb.adb_table_import_new(self.db._ptr, cat_class.encode('utf-8'), cat_id.encode('utf-8'), table_name.encode('utf-8'), depth_field.encode('utf-8'), min_limit, max_limit, otype)
-        if res < 0:
-            raise AstroDBError("Failed to configure new table import.")
+    @classmethod
+    def import_new(cls, db: Database, cat_class: str, cat_id: str, table_name: str, depth_field: str, min_limit: float, max_limit: float, otype: int = ADB_IMPORT_INC):
+        table = cls.__new__(cls)
+        table.db = db
+        # C keeps a reference to depth_field, keep the encoded strings alive
+        table._kept_strings = [_utf8(s) for s in (cat_class, cat_id, table_name, depth_field)]
+        table._count = None
+        table._offsets = {}
+        table.table_id = _adb_table_import_new(db._ptr, *table._kept_strings, min_limit, max_limit, otype)
+        table._finalizer = weakref.finalize(table, _table_close, db, table.table_id)
+        return table
+
+    def import_schema(self, schema, object_size: int):
+        # schema is an (adb_schema_field * N) array, keep it and its callbacks alive for the import
+        self._schema = schema
+        self.invalidate()
+        return _adb_table_import_schema(self.db._ptr, self.table_id, schema, len(schema), object_size)
 
     def import_field(self, field: str, alt: str, flags: int):
-        res = libadb.adb_table_import_field(self.db._ptr, self.table_id, field.encode('utf-8'), alt.encode('utf-8'), flags)
-        if res < 0:
-            raise AstroDBError(f"Failed to set alternative import field for {field}.")
+        _adb_table_import_field(self.db._ptr, self.table_id, _utf8(field), _utf8(alt), flags)
 
     def import_alt_dataset(self, dataset: str, num_objects: int):
-        res = libadb.adb_table_import_alt_dataset(self.db._ptr, self.table_id, dataset.encode('utf-8'), num_objects)
-        if res < 0:
-            raise AstroDBError("Failed to set alternative import dataset schema.")
+        bdataset = _utf8(dataset)
+        self._kept_strings.append(bdataset)
+        _adb_table_import_alt_dataset(self.db._ptr, self.table_id, bdataset, num_objects)
 
     def run_import(self):
-        res = libadb.adb_table_import(self.db._ptr, self.table_id)
-        if res < 0:
-            raise AstroDBError("Failed to run full database importing routine.")
+        self.invalidate()
+        _adb_table_import(self.db._ptr, self.table_id)
 
     def get_field_type(self, field: str) -> int:
-        return libadb.adb_table_get_field_type(self.db._ptr, self.table_id, field.encode('utf-8'))
+        return _adb_table_get_field_type(self.db._ptr, self.table_id, _utf8(field))
 
     def get_field_offset(self, field: str) -> int:
-        return libadb.adb_table_get_field_offset(self.db._ptr, self.table_id, field.encode('utf-8'))
+        # the schema is fixed until the next import, so each field is looked
+        # up in C once rather than for every object it is read from
+        offset = self._offsets.get(field)
+        if offset is None:
+            offset = _adb_table_get_field_offset(self.db._ptr, self.table_id, _utf8(field))
+            self._offsets[field] = offset
+        return offset
 
     def close(self):
-        if self.table_id >= 0 and self.db._ptr:
-            libadb.adb_table_close(self.db._ptr, self.table_id)
-            self.table_id = -1
+        self._finalizer()
+        self.table_id = -1
+        self.invalidate()
 
-    def __del__(self):
-        self.close()
-
-class ObjectSet:
+class ObjectSet(_Handle):
     def __init__(self, table: Table):
         self.table = table
-        self._ptr = libadb.adb_table_set_new(table.db._ptr, table.table_id)
+        self._ptr = _adb_table_set_new(table.db._ptr, table.table_id)
         self._kept_strings = [] # Keep referenced memory alive for C structs
         self._head_count = 0
+        self._count = None
         if not self._ptr:
             raise AstroDBError("Failed to allocate ObjectSet.")
+        self._finalizer = weakref.finalize(self, _adb_table_set_free, self._ptr)
 
     def apply_constraints(self, ra: float, dec: float, fov: float, min_z: float, max_z: float):
-        res = libadb.adb_table_set_constraints(self._ptr, ra, dec, fov, min_z, max_z)
-        if res < 0:
-            raise AstroDBError(f"Constraints failed with error {res}")
+        self.invalidate()
+        _adb_table_set_constraints(self._ptr, ra, dec, fov, min_z, max_z)
 
     def populate(self):
-        res = libadb.adb_set_get_objects(self._ptr)
-        if res < 0:
-            raise AstroDBError("Failed to populate object set.")
-        self._head_count = res
+        self.invalidate()
+        self._head_count = _adb_set_get_objects(self._ptr)
+
+    def count_fields(self, ra, dec, fov, min_z: float, max_z: float) -> list:
+        """Object count of each (ra[i], dec[i], fov[i]) field in one C call.
+
+        Equivalent to apply_constraints() and populate() per field followed
+        by len(), but crosses into C once for the whole batch. fov may be a
+        single radius for every field. NumPy float64 arrays are passed by
+        pointer, other sequences are copied. The set is left populated for
+        the last field.
+        """
+        num = len(ra)
+        if isinstance(fov, numbers.Real) or (np is not None and np.ndim(fov) == 0):
+            fov = [float(fov)] * num
+        if len(dec) != num or len(fov) != num:
+            raise AstroDBError("ra, dec and fov must be the same length")
+        keep = [_doubles(v) for v in (ra, dec, fov)]
+        counts = array.array('i', bytes(ctypes.sizeof(ctypes.c_int) * num))
+        self.invalidate()
+        self._head_count = _adb_table_set_constraints_batch(
+            self._ptr, num, *(ptr for ptr, _ in keep), min_z, max_z,
+            (ctypes.c_int * num).from_buffer(counts))
+        return counts.tolist()
 
     def __len__(self):
-        count = libadb.adb_set_get_count(self._ptr)
-        return count if count >= 0 else 0
+        # constraints, populate() and any search or solve over the set
+        # change the count, each of them drops the cache
+        if self._count is None:
+            count = _adb_set_get_count(self._ptr)
+            self._count = count if count >= 0 else 0
+        return self._count
+
+    def invalidate(self):
+        """Drop the cached object count, anything that fills the set does this."""
+        self._count = None
+
+    def trixels(self) -> list:
+        """HTM trixels covering the populated set.
+
+        Returns (hemisphere, quadrant, depth, position) tuples for the
+        trixels the constraints clipped, i.e. the only parts of the table
+        populate() read.
+        """
+        count = _adb_set_get_trixels(self._ptr, None, 0)
+        ids = (adb_trixel_id * count)()
+        _adb_set_get_trixels(self._ptr, ids, count)
+        return [(t.hemisphere, t.quadrant, t.depth, t.position) for t in ids]
 
     def hash_key(self, key: str):
-        bkey = key.encode('utf-8')
+        bkey = _utf8(key)
         self._kept_strings.append(bkey)
-        res = libadb.adb_set_hash_key(self._ptr, bkey)
-        if res < 0:
-            raise AstroDBError(f"Failed to set hash key {key} on ObjectSet.")
+        _adb_set_hash_key(self._ptr, bkey)
 
     def get_object(self, id_val, field: str):
         if isinstance(id_val, int):
             c_val = ctypes.c_int(id_val)
             ptr = ctypes.cast(ctypes.pointer(c_val), ctypes.c_void_p)
-        elif isinstance(id_val, str):
-            c_val = ctypes.create_string_buffer(id_val.encode('utf-8'))
+        elif isinstance(id_val, (str, bytes)):
+            c_val = ctypes.create_string_buffer(_utf8(id_val))
             ptr = ctypes.cast(c_val, ctypes.c_void_p)
         else:
             raise AstroDBError("id_val must be int or str")
         obj_ptr = adb_object_p()
-        res = libadb.adb_set_get_object(self._ptr, ptr, field.encode('utf-8'), ctypes.byref(obj_ptr))
-        if res < 0:
-            raise AstroDBError(f"Failed to set_get_object with ID {id_val} on field {field}, error: {res}")
+        _adb_set_get_object(self._ptr, ptr, _utf8(field), ctypes.byref(obj_ptr))
         return AstroObject(obj_ptr.contents, self.table) if obj_ptr else None
 
     def get_nearest_on_pos(self, ra: float, dec: float):
-        obj_ptr = libadb.adb_table_set_get_nearest_on_pos(self._ptr, ra, dec)
+        obj_ptr = _adb_table_set_get_nearest_on_pos(self._ptr, ra, dec)
         if not bool(obj_ptr): # Check if pointer is NULL
             return None
         return AstroObject(obj_ptr.contents, self.table)
@@ -254,7 +479,7 @@ class ObjectSet:
 
     @property
     def head(self) -> dict:
-        head_ptr = libadb.adb_set_get_head(self._ptr)
+        head_ptr = _adb_set_get_head(self._ptr)
         if not head_ptr:
             return None
         return {"objects_ptr": head_ptr.contents.objects, "count": head_ptr.contents.count}
@@ -264,14 +489,14 @@ class ObjectSet:
         if self._head_count <= 0:
             return
             
-        head_arr_ptr = libadb.adb_set_get_head(self._ptr)
+        head_arr_ptr = _adb_set_get_head(self._ptr)
         if not bool(head_arr_ptr):
             return
             
-        head_arr = ctypes.cast(head_arr_ptr, ctypes.POINTER(lib.adb_object_head))
+        head_arr = ctypes.cast(head_arr_ptr, ctypes.POINTER(adb_object_head))
         # Important: the layout in memory for custom dataset items relies on `table.object_size` dynamically computed by DB at open.
         # But we don't have python subclasses. We can cast generically to byte arrays or adb_object wrappers.
-        object_bytes_size = self.table.size
+        object_bytes_size = self.table.object_size
         
         for i in range(self._head_count):
             head_obj = head_arr[i]
@@ -285,158 +510,301 @@ class ObjectSet:
                 obj_ref = ctypes.cast(addr, adb_object_p).contents
                 yield AstroObject(obj_ref, self.table)
 
-    def close(self):
-        if self._ptr:
-            libadb.adb_table_set_free(self._ptr)
-            self._ptr = None
-
-    def __del__(self):
-        self.close()
+    def _heads(self):
+        head_arr = _adb_set_get_head(self._ptr) if self._head_count > 0 else None
+        if not head_arr:
+            return []
+        return [head_arr[i] for i in range(self._head_count) if head_arr[i].count and head_arr[i].objects]
+
+    def to_numpy(self, obj_type=None):
+        """Return the populated objects as a structured array.
+
+        Without obj_type rows are ADB_OBJECT_DTYPE. With the catalogue
+        object structure, e.g. the ctypes class passed to build_schema(),
+        rows carry every catalogue field too, see adb_numpy_dtype().
+
+        Each object head is viewed in place with the table object stride and
+        copied out in one slice assignment per head, so the result does not
+        depend on the set staying alive.
+        """
+        dtype = self.table._numpy_dtype(obj_type)
+        heads = self._heads()
+        stride = self.table.object_size
+        itemsize = dtype.itemsize
+        out = np.empty(sum(h.count for h in heads), dtype=dtype)
+        rows = out.view(np.uint8).reshape(len(out), itemsize)
+        pos = 0
+        for head in heads:
+            buf = (ctypes.c_char * (head.count * stride)).from_address(head.objects)
+            rows[pos:pos + head.count] = np.frombuffer(buf, dtype=np.uint8).reshape(head.count, stride)[:, :itemsize]
+            pos += head.count
+        return out
+
+    def numpy_views(self, obj_type=None) -> list:
+        """Zero copy structured array views, one per object head.
+
+        Rows are as to_numpy() but the arrays alias the set's memory, so
+        they are only valid until the set is repopulated or closed.
+        """
+        dtype = self.table._numpy_dtype(obj_type, strided=True)
+        stride = self.table.object_size
+        return [np.frombuffer((ctypes.c_char * (h.count * stride)).from_address(h.objects), dtype=dtype)
+                for h in self._heads()]
+
+    def filter_numpy(self, mag_lt: float = None, ra_between: tuple = None, dec_between: tuple = None,
+                     near: tuple = None):
+        """Filter the populated objects with vectorised NumPy masks.
+
+        Bounds are exclusive and in the units stored in struct adb_object,
+        i.e. RA/DEC in radians. near is (ra0, dec0, radius) and keeps the
+        objects within radius of that position, see simd.within_radius().
+        Returns the matching rows of to_numpy().
+        """
+        arr = self.to_numpy()
+        mask = np.ones(len(arr), dtype=bool)
+        if mag_lt is not None:
+            mask &= arr['mag'] < mag_lt
+        if ra_between is not None:
+            mask &= (arr['ra'] > ra_between[0]) & (arr['ra'] < ra_between[1])
+        if dec_between is not None:
+            mask &= (arr['dec'] > dec_between[0]) & (arr['dec'] < dec_between[1])
+        if near is not None:
+            from .simd import within_radius
+            mask &= within_radius(arr['ra'], arr['dec'], *near)
+        return arr[mask]
+
+
+def compile_terms(terms) -> ctypes.Array:
+    """Build the struct adb_search_term array for a Search.add_terms() expression.
+
+    The C search copies the fields and values it is given, so a constant
+    expression can be compiled once, e.g. at module import, and the array
+    passed to any number of searches without being rebuilt.
+    """
+    arr = (adb_search_term * len(terms))()
+    for i, term in enumerate(terms):
+        if isinstance(term, tuple):
+            field, comp, value = term
+            if isinstance(comp, AdbOp):
+                raise AstroDBError(f"{comp!r} is an operator, not a search comparator")
+            arr[i].field = _utf8(field)
+            arr[i].comp = AdbComp(comp).value
+            arr[i].value = _utf8(value)
+        else:
+            if isinstance(term, AdbComp):
+                raise AstroDBError(f"{term!r} is a comparator, not a search operator")
+            arr[i].op = AdbOp(term).value
+    return arr
 
-class Search:
+class Search(_Handle):
     def __init__(self, table: Table):
         self.table = table
-        self._ptr = libadb.adb_search_new(table.db._ptr, table.table_id)
+        self._ptr = _adb_search_new(table.db._ptr, table.table_id)
         if not self._ptr:
             raise AstroDBError("Failed to create search context.")
-
-    def add_operator(self, op: int):
-        res = libadb.adb_search_add_operator(self._ptr, op)
-        if res < 0:
-            raise AstroDBError("Failed to add operator.")
-
-    def add_comparator(self, field: str, comp: int, value: str):
-        res = libadb.adb_search_add_comparator(
+        self._finalizer = weakref.finalize(self, _adb_search_free, self._ptr)
+
+    def add_operator(self, op: AdbOp):
+        # both enums are ints, stop a comparator being taken as an operator
+        if isinstance(op, AdbComp):
+            raise AstroDBError(f"{op!r} is a comparator, not a search operator")
+        _adb_search_add_operator(self._ptr, AdbOp(op).value)
+
+    def add_comparator(self, field: str, comp: AdbComp, value: str):
+        if isinstance(comp, AdbOp):
+            raise AstroDBError(f"{comp!r} is an operator, not a search comparator")
+        _adb_search_add_comparator(
             self._ptr,
-            field.encode('utf-8'),
-            comp,
-            value.encode('utf-8')
+            _utf8(field),
+            AdbComp(comp).value,
+            _utf8(value)
         )
-        if res < 0:
-            raise AstroDBError("Failed to add comparator.")
+
+    def add_terms(self, terms):
+        """Push a whole RPN expression in one call into libadb.
+
+        Each term is either an AdbOp operator or a (field, AdbComp, value)
+        comparator tuple, in the order add_operator() and add_comparator()
+        would be called, e.g.
+        [("RV", AdbComp.LT, "40"), ("RV", AdbComp.GT, "25"), AdbOp.AND].
+        terms may also be an array from compile_terms(), which is passed
+        to C as is.
+        """
+        if not isinstance(terms, ctypes.Array):
+            terms = compile_terms(terms)
+        _adb_search_add_terms(self._ptr, terms, len(terms))
+
+    def add_box(self, ra_min: float, ra_max: float, dec_min: float, dec_max: float, mag_max: float = None):
+        """Push an RA/DEC (radians, exclusive) and optional mag < mag_max box
+        joined by AND, in one call instead of a comparator/operator sequence.
+        """
+        box = adb_search_box(ra_min, ra_max, dec_min, dec_max,
+                             math.nan if mag_max is None else mag_max)
+        _adb_search_add_box(self._ptr, ctypes.byref(box))
+
+    def add_cone(self, ra: float, dec: float, radius: float):
+        """Push an AND joined test for objects within radius of (ra, dec),
+        all in radians. Matching is a DEC range check and a unit vector
+        dot product against cos(radius), no per object inverse trig.
+        """
+        _adb_search_add_cone(self._ptr, ra, dec, radius)
 
     def add_custom_comparator(self, callback: callable):
         from .lib import adb_custom_comparator
         self._c_callback = adb_custom_comparator(callback)
-        res = libadb.adb_search_add_custom_comparator(self._ptr, self._c_callback)
-        if res < 0:
-            raise AstroDBError("Failed to add custom comparator.")
+        _adb_search_add_custom_comparator(self._ptr, self._c_callback)
+
+    def execute(self, obj_set: ObjectSet, packed: bool = False):
+        """Run the search over obj_set and return the number of hits.
+
+        With packed=True the C library copies the hits into one contiguous
+        block owned by the search, so iteration and to_numpy() read them at
+        a fixed stride instead of through a pointer per hit. That block is
+        only valid until the next execute() or close().
+        """
+        self._packed = None
+        if packed:
+            self._results_arr = None
+            self._packed = ctypes.c_void_p()
+            count = ctypes.c_int()
+            hit_count = _adb_search_get_results_packed(self._ptr, obj_set._ptr, ctypes.byref(self._packed), ctypes.byref(count))
+            # the search filled obj_set, pick up its trixels and count
+            obj_set.populate()
+            self._hit_count = hit_count
+            return hit_count
 
-    def execute(self, obj_set: ObjectSet):
         # We need a double pointer for results: const struct adb_object **objects[]
         # We allocate an array of pointers
         self._results_arr = ctypes.POINTER(adb_object_p)()
         
-        hit_count = libadb.adb_search_get_results(self._ptr, obj_set._ptr, ctypes.cast(ctypes.byref(self._results_arr), ctypes.c_void_p))
-        
-        if hit_count < 0:
-            raise AstroDBError(f"Search execution failed with {hit_count}")
-        
+        hit_count = _adb_search_get_results(self._ptr, obj_set._ptr, ctypes.cast(ctypes.byref(self._results_arr), ctypes.c_void_p))
+        obj_set.populate()
         self._hit_count = hit_count
         return hit_count
 
     def __iter__(self):
-        if not getattr(self, '_hit_count', 0) or not getattr(self, '_results_arr', None):
+        if not getattr(self, '_hit_count', 0):
+            return
+        if getattr(self, '_packed', None):
+            stride = self.table.object_size
+            base = self._packed.value
+            for i in range(self._hit_count):
+                yield AstroObject(adb_object.from_address(base + i * stride), self.table)
+            return
+        if not getattr(self, '_results_arr', None):
             return
         for i in range(self._hit_count):
             obj_ptr = self._results_arr[i]
             if obj_ptr:
                 yield AstroObject(obj_ptr.contents, self.table)
 
+    def to_numpy(self):
+        """Return the hits of the last execute() as an ADB_OBJECT_DTYPE structured array.
+
+        No Python object is created per hit. Packed results are copied with a
+        single strided slice, otherwise the C result pointers are read
+        through a NumPy view and each object is copied straight into the array.
+        """
+        if np is None:
+            raise AstroDBError("numpy is required for Search.to_numpy()")
+        count = getattr(self, '_hit_count', 0)
+        out = np.empty(count, dtype=ADB_OBJECT_DTYPE)
+        if count <= 0:
+            return out
+
+        itemsize = ADB_OBJECT_DTYPE.itemsize
+        if getattr(self, '_packed', None):
+            stride = self.table.object_size
+            buf = (ctypes.c_char * (count * stride)).from_address(self._packed.value)
+            rows = out.view(np.uint8).reshape(count, itemsize)
+            rows[:] = np.frombuffer(buf, dtype=np.uint8).reshape(count, stride)[:, :itemsize]
+            return out
+
+        ptrs = np.ctypeslib.as_array(ctypes.cast(self._results_arr, ctypes.POINTER(ctypes.c_size_t)), shape=(count,))
+        dest = out.ctypes.data
+        for addr in ptrs.tolist():
+            ctypes.memmove(dest, addr, itemsize)
+            dest += itemsize
+        return out
+
     @property
     def hits(self):
-        return libadb.adb_search_get_hits(self._ptr)
+        return _adb_search_get_hits(self._ptr)
 
     @property
     def tests(self):
-        return libadb.adb_search_get_tests(self._ptr)
-
-    def close(self):
-        if self._ptr:
-            libadb.adb_search_free(self._ptr)
-            self._ptr = None
+        return _adb_search_get_tests(self._ptr)
 
-    def __del__(self):
-        self.close()
 
 class Solution:
     def __init__(self, solver: 'Solver', index: int):
         self.solver = solver
-        self._ptr = libadb.adb_solve_get_solution(solver._ptr, index)
+        self._ptr = _adb_solve_get_solution(solver._ptr, index)
         if not self._ptr:
             raise AstroDBError(f"No solution found at index {index}")
 
         # Ensure objects are loaded
-        libadb.adb_solution_get_objects(self._ptr)
+        _adb_solution_get_objects(self._ptr)
 
     @property
     def divergence(self) -> float:
-        return libadb.adb_solution_get_divergence(self._ptr) if hasattr(libadb, 'adb_solution_get_divergence') else libadb.adb_solution_divergence(self._ptr)
+        return _adb_solution_divergence(self._ptr)
 
     @property
     def pixel_size(self) -> float:
-        return libadb.adb_solution_get_pixel_size(self._ptr)
+        return _adb_solution_get_pixel_size(self._ptr)
 
     def get_equ_bounds(self, bounds: int) -> tuple[float, float]:
         ra = ctypes.c_double()
         dec = ctypes.c_double()
-        libadb.adb_solution_get_plate_equ_bounds(self._ptr, bounds, ctypes.byref(ra), ctypes.byref(dec))
+        _adb_solution_get_plate_equ_bounds(self._ptr, bounds, ctypes.byref(ra), ctypes.byref(dec))
         return ra.value, dec.value
 
     def plate_to_equ(self, x: int, y: int) -> tuple[float, float]:
         ra = ctypes.c_double()
         dec = ctypes.c_double()
-        libadb.adb_solution_plate_to_equ_position(self._ptr, x, y, ctypes.byref(ra), ctypes.byref(dec))
+        _adb_solution_plate_to_equ_position(self._ptr, x, y, ctypes.byref(ra), ctypes.byref(dec))
         return ra.value, dec.value
 
     def equ_to_plate(self, ra: float, dec: float) -> tuple[float, float]:
         x = ctypes.c_double()
         y = ctypes.c_double()
-        libadb.adb_solution_equ_to_plate_position(self._ptr, ra, dec, ctypes.byref(x), ctypes.byref(y))
+        _adb_solution_equ_to_plate_position(self._ptr, ra, dec, ctypes.byref(x), ctypes.byref(y))
         return x.value, y.value
 
-class Solver:
+class Solver(_Handle):
     def __init__(self, table: Table):
         self.table = table
-        self._ptr = libadb.adb_solve_new(table.db._ptr, table.table_id)
+        self._ptr = _adb_solve_new(table.db._ptr, table.table_id)
         if not self._ptr:
             raise AstroDBError("Failed to create solver context.")
+        self._finalizer = weakref.finalize(self, _adb_solve_free, self._ptr)
 
     def set_magnitude_delta(self, delta: float):
-        libadb.adb_solve_set_magnitude_delta(self._ptr, delta)
+        _adb_solve_set_magnitude_delta(self._ptr, delta)
 
     def set_distance_delta(self, delta: float):
-        libadb.adb_solve_set_distance_delta(self._ptr, delta)
+        _adb_solve_set_distance_delta(self._ptr, delta)
 
     def set_pa_delta(self, delta: float):
-        libadb.adb_solve_set_pa_delta(self._ptr, delta)
+        _adb_solve_set_pa_delta(self._ptr, delta)
 
     def add_plate_object(self, x: int, y: int, adu: int = 1, extended: int = 0):
         pobj = adb_pobject(x=x, y=y, adu=adu, extended=extended)
-        res = libadb.adb_solve_add_plate_object(self._ptr, ctypes.byref(pobj))
-        if res < 0:
-            raise AstroDBError("Failed to add plate object.")
+        _adb_solve_add_plate_object(self._ptr, ctypes.byref(pobj))
 
     def add_constraint(self, constraint_type: int, min_val: float, max_val: float):
-        res = libadb.adb_solve_constraint(self._ptr, constraint_type, min_val, max_val)
-        if res < 0:
-            raise AstroDBError("Failed to set constraint.")
+        _adb_solve_constraint(self._ptr, constraint_type, min_val, max_val)
 
     def execute(self, obj_set: ObjectSet = None, find_flags: int = ADB_FIND_ALL):
-        set_ptr = obj_set._ptr if obj_set else None
-        res = libadb.adb_solve(self._ptr, set_ptr, find_flags)
-        if res < 0:
-            raise AstroDBError(f"Solve execution failed with code {res}")
-        return res
+        set_ptr = obj_set._ptr if obj_set is not None else None
+        found = _adb_solve(self._ptr, set_ptr, find_flags)
+        if obj_set is not None:
+            # solving fills obj_set like a search does
+            obj_set.populate()
+        return found
 
     def get_solution(self, index: int = 0) -> Solution:
         return Solution(self, index)
 
-    def close(self):
-        if self._ptr:
-            libadb.adb_solve_free(self._ptr)
-            self._ptr = None
-
-    def __del__(self):
-        self.close()
 
@@ -1,7 +1,14 @@
 import ctypes
 import ctypes.util
+import functools
 import os
 import sys
+from enum import IntEnum
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # Attempt to load libastrodb.so
 _lib_name = "astrodb"
@@ -31,6 +38,21 @@ ADB_CTYPE_DEGREES = 3
 ADB_CTYPE_FLOAT = 4
 ADB_CTYPE_STRING = 5
 
+class AstroDBError(Exception):
+    """Base exception for astrodb wrapper errors."""
+    pass
+
+def _check_status(res, func, args):
+    """ctypes errcheck for C calls that return a negative errno on failure."""
+    if res < 0:
+        raise AstroDBError(f"{func.__name__} failed with error {res}")
+    return res
+
+# Angle conversions, radians are used throughout the C API
+D2R = 1.7453292519943295769e-2
+R2D = 5.7295779513082320877e1
+TWO_PI = 6.283185307179586
+
 # Define opaque pointer types to match C structures
 class adb_library_p(ctypes.c_void_p): pass
 class adb_db_p(ctypes.c_void_p): pass
@@ -59,6 +81,46 @@ class adb_object(ctypes.Structure):
 
 adb_object_p = ctypes.POINTER(adb_object)
 
+# NumPy view of struct adb_object (id and designation share the key union)
+if np is not None:
+    ADB_OBJECT_DTYPE = np.dtype({
+        'names': ['id', 'designation', 'ra', 'dec', 'mag', 'size'],
+        'formats': [np.dtype(ctypes.c_ulong), 'S16', np.float64, np.float64, np.float32, np.float32],
+        'offsets': [adb_object.id.offset, adb_object.designation.offset, adb_object.ra.offset,
+                    adb_object.dec.offset, adb_object.mag.offset, adb_object.size.offset],
+        'itemsize': ctypes.sizeof(adb_object),
+    })
+else:
+    ADB_OBJECT_DTYPE = None
+
+@functools.lru_cache(maxsize=None)
+def adb_numpy_dtype(cls):
+    """NumPy dtype for the catalogue object structure cls.
+
+    An embedded struct adb_object is flattened so its id, designation, ra,
+    dec, mag and size sit alongside the catalogue fields, e.g. arr['ra']
+    and arr['pmRA'].
+    """
+    names, formats, offsets = [], [], []
+    for name, ctype, *_ in cls._fields_:
+        offset = getattr(cls, name).offset
+        if ctype is adb_object:
+            for sub in ADB_OBJECT_DTYPE.names:
+                fmt, sub_offset = ADB_OBJECT_DTYPE.fields[sub][:2]
+                names.append(sub)
+                formats.append(fmt)
+                offsets.append(offset + sub_offset)
+            continue
+        if issubclass(ctype, ctypes.Array) and ctype._type_ is ctypes.c_char:
+            fmt = f'S{ctype._length_}'
+        else:
+            fmt = np.dtype(ctype)
+        names.append(name)
+        formats.append(fmt)
+        offsets.append(offset)
+    return np.dtype({'names': names, 'formats': formats, 'offsets': offsets,
+                     'itemsize': ctypes.sizeof(cls)})
+
 class adb_object_head(ctypes.Structure):
     _fields_ = [
         ("objects", ctypes.c_void_p),
@@ -93,14 +155,17 @@ adb_solve_object_p = ctypes.POINTER(adb_solve_object)
 # struct adb_library *adb_open_library(const char *host, const char *remote, const char *local);
 libadb.adb_open_library.argtypes = [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p]
 libadb.adb_open_library.restype = adb_library_p
+_adb_open_library = libadb.adb_open_library
 
 # void adb_close_library(struct adb_library *lib);
 libadb.adb_close_library.argtypes = [adb_library_p]
 libadb.adb_close_library.restype = None
+_adb_close_library = libadb.adb_close_library
 
 # const char *adb_get_version(void);
 libadb.adb_get_version.argtypes = []
 libadb.adb_get_version.restype = ctypes.c_char_p
+_adb_get_version = libadb.adb_get_version
 
 
 ### Database Bindings ###
@@ -108,10 +173,12 @@ libadb.adb_get_version.restype = ctypes.c_char_p
 # struct adb_db *adb_create_db(struct adb_library *lib, int depth, int tables);
 libadb.adb_create_db.argtypes = [adb_library_p, ctypes.c_int, ctypes.c_int]
 libadb.adb_create_db.restype = adb_db_p
+_adb_create_db = libadb.adb_create_db
 
 # void adb_db_free(struct adb_db *db);
 libadb.adb_db_free.argtypes = [adb_db_p]
 libadb.adb_db_free.restype = None
+_adb_db_free = libadb.adb_db_free
 
 
 ### Table Bindings ###
@@ -119,26 +186,40 @@ libadb.adb_db_free.restype = None
 # int adb_table_open(struct adb_db *db, const char *cat_class, const char *cat_id, const char *table_name);
 libadb.adb_table_open.argtypes = [adb_db_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p]
 libadb.adb_table_open.restype = ctypes.c_int
+libadb.adb_table_open.errcheck = _check_status
+_adb_table_open = libadb.adb_table_open
 
 # int adb_table_close(struct adb_db *db, int table_id);
 libadb.adb_table_close.argtypes = [adb_db_p, ctypes.c_int]
 libadb.adb_table_close.restype = ctypes.c_int
+_adb_table_close = libadb.adb_table_close
 
 # int adb_table_get_count(struct adb_db *db, int table_id);
 libadb.adb_table_get_count.argtypes = [adb_db_p, ctypes.c_int]
 libadb.adb_table_get_count.restype = ctypes.c_int
+_adb_table_get_count = libadb.adb_table_get_count
 
 # int adb_table_hash_key(struct adb_db *db, int table_id, const char *key);
 libadb.adb_table_hash_key.argtypes = [adb_db_p, ctypes.c_int, ctypes.c_char_p]
 libadb.adb_table_hash_key.restype = ctypes.c_int
+libadb.adb_table_hash_key.errcheck = _check_status
+_adb_table_hash_key = libadb.adb_table_hash_key
 
 # int adb_table_get_size(struct adb_db *db, int table_id);
 libadb.adb_table_get_size.argtypes = [adb_db_p, ctypes.c_int]
 libadb.adb_table_get_size.restype = ctypes.c_int
+_adb_table_get_size = libadb.adb_table_get_size
 
 # int adb_table_get_object_size(struct adb_db *db, int table_id);
 libadb.adb_table_get_object_size.argtypes = [adb_db_p, ctypes.c_int]
 libadb.adb_table_get_object_size.restype = ctypes.c_int
+_adb_table_get_object_size = libadb.adb_table_get_object_size
+
+# int adb_table_get_objects(struct adb_db *db, int table_id, const void **objects);
+libadb.adb_table_get_objects.argtypes = [adb_db_p, ctypes.c_int, ctypes.POINTER(ctypes.c_void_p)]
+libadb.adb_table_get_objects.restype = ctypes.c_int
+libadb.adb_table_get_objects.errcheck = _check_status
+_adb_table_get_objects = libadb.adb_table_get_objects
 
 
 ### Dataset Constraining (Object Sets) ###
@@ -146,92 +227,192 @@ libadb.adb_table_get_object_size.restype = ctypes.c_int
 # struct adb_object_set *adb_table_set_new(struct adb_db *db, int table_id);
 libadb.adb_table_set_new.argtypes = [adb_db_p, ctypes.c_int]
 libadb.adb_table_set_new.restype = adb_object_set_p
+_adb_table_set_new = libadb.adb_table_set_new
 
 # int adb_table_set_constraints(struct adb_object_set *set, double ra, double dec, double fov, double min_Z, double max_Z);
 libadb.adb_table_set_constraints.argtypes = [adb_object_set_p, ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.c_double, ctypes.c_double]
 libadb.adb_table_set_constraints.restype = ctypes.c_int
+libadb.adb_table_set_constraints.errcheck = _check_status
+_adb_table_set_constraints = libadb.adb_table_set_constraints
+
+# int adb_table_set_constraints_batch(struct adb_object_set *set, int num, const double *ra, const double *dec, const double *fov, double min_Z, double max_Z, int *counts);
+libadb.adb_table_set_constraints_batch.argtypes = [adb_object_set_p, ctypes.c_int, ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double), ctypes.c_double, ctypes.c_double, ctypes.POINTER(ctypes.c_int)]
+libadb.adb_table_set_constraints_batch.restype = ctypes.c_int
+libadb.adb_table_set_constraints_batch.errcheck = _check_status
+_adb_table_set_constraints_batch = libadb.adb_table_set_constraints_batch
 
 # void adb_table_set_free(struct adb_object_set *set);
 libadb.adb_table_set_free.argtypes = [adb_object_set_p]
 libadb.adb_table_set_free.restype = None
+_adb_table_set_free = libadb.adb_table_set_free
 
 # int adb_set_get_objects(struct adb_object_set *set);
 libadb.adb_set_get_objects.argtypes = [adb_object_set_p]
 libadb.adb_set_get_objects.restype = ctypes.c_int
+libadb.adb_set_get_objects.errcheck = _check_status
+_adb_set_get_objects = libadb.adb_set_get_objects
 
 # int adb_set_get_count(struct adb_object_set *set);
 libadb.adb_set_get_count.argtypes = [adb_object_set_p]
 libadb.adb_set_get_count.restype = ctypes.c_int
+_adb_set_get_count = libadb.adb_set_get_count
+
+class adb_trixel_id(ctypes.Structure):
+    _fields_ = [
+        ("hemisphere", ctypes.c_uint),
+        ("quadrant", ctypes.c_uint),
+        ("depth", ctypes.c_uint),
+        ("position", ctypes.c_uint),
+    ]
+
+# int adb_set_get_trixels(struct adb_object_set *set, struct adb_trixel_id *ids, int max);
+libadb.adb_set_get_trixels.argtypes = [adb_object_set_p, ctypes.POINTER(adb_trixel_id), ctypes.c_int]
+libadb.adb_set_get_trixels.restype = ctypes.c_int
+_adb_set_get_trixels = libadb.adb_set_get_trixels
 
 # int adb_set_hash_key(struct adb_object_set *set, const char *key);
 libadb.adb_set_hash_key.argtypes = [adb_object_set_p, ctypes.c_char_p]
 libadb.adb_set_hash_key.restype = ctypes.c_int
+libadb.adb_set_hash_key.errcheck = _check_status
+_adb_set_hash_key = libadb.adb_set_hash_key
 
 # int adb_set_get_object(struct adb_object_set *set, const void *id, const char *field, const struct adb_object **object);
 libadb.adb_set_get_object.argtypes = [adb_object_set_p, ctypes.c_void_p, ctypes.c_char_p, ctypes.POINTER(adb_object_p)]
 libadb.adb_set_get_object.restype = ctypes.c_int
+libadb.adb_set_get_object.errcheck = _check_status
+_adb_set_get_object = libadb.adb_set_get_object
 
 # int adb_table_get_object(struct adb_db *db, int table_id, const void *id, const char *field, const struct adb_object **object);
 libadb.adb_table_get_object.argtypes = [adb_db_p, ctypes.c_int, ctypes.c_void_p, ctypes.c_char_p, ctypes.POINTER(adb_object_p)]
 libadb.adb_table_get_object.restype = ctypes.c_int
+libadb.adb_table_get_object.errcheck = _check_status
+_adb_table_get_object = libadb.adb_table_get_object
 
 # const struct adb_object *adb_table_set_get_nearest_on_object(struct adb_object_set *set, const struct adb_object *object);
 libadb.adb_table_set_get_nearest_on_object.argtypes = [adb_object_set_p, adb_object_p]
 libadb.adb_table_set_get_nearest_on_object.restype = adb_object_p
+_adb_table_set_get_nearest_on_object = libadb.adb_table_set_get_nearest_on_object
 
 # const struct adb_object *adb_table_set_get_nearest_on_pos(struct adb_object_set *set, double ra, double dec);
 libadb.adb_table_set_get_nearest_on_pos.argtypes = [adb_object_set_p, ctypes.c_double, ctypes.c_double]
 libadb.adb_table_set_get_nearest_on_pos.restype = adb_object_p
+_adb_table_set_get_nearest_on_pos = libadb.adb_table_set_get_nearest_on_pos
 
 # struct adb_object_head *adb_set_get_head(struct adb_object_set *set);
 libadb.adb_set_get_head.argtypes = [adb_object_set_p]
 libadb.adb_set_get_head.restype = adb_object_head_p
+_adb_set_get_head = libadb.adb_set_get_head
 
 
 ### Search Bindings ###
 
-# enum constants
-ADB_OP_AND = 0
-ADB_OP_OR = 1
+# enum adb_operator
+class AdbOp(IntEnum):
+    AND = 0
+    OR = 1
+
+# enum adb_comparator
+class AdbComp(IntEnum):
+    LT = 0
+    GT = 1
+    EQ = 2
+    NE = 3
 
-ADB_COMP_LT = 0
-ADB_COMP_GT = 1
-ADB_COMP_EQ = 2
-ADB_COMP_NE = 3
+# Old names, kept as aliases for one release
+ADB_OP_AND = AdbOp.AND
+ADB_OP_OR = AdbOp.OR
+
+ADB_COMP_LT = AdbComp.LT
+ADB_COMP_GT = AdbComp.GT
+ADB_COMP_EQ = AdbComp.EQ
+ADB_COMP_NE = AdbComp.NE
 
 # struct adb_search *adb_search_new(struct adb_db *db, int table_id);
 libadb.adb_search_new.argtypes = [adb_db_p, ctypes.c_int]
 libadb.adb_search_new.restype = adb_search_p
+_adb_search_new = libadb.adb_search_new
 
 # void adb_search_free(struct adb_search *search);
 libadb.adb_search_free.argtypes = [adb_search_p]
 libadb.adb_search_free.restype = None
+_adb_search_free = libadb.adb_search_free
 
 # int adb_search_add_operator(struct adb_search *search, enum adb_operator op);
 libadb.adb_search_add_operator.argtypes = [adb_search_p, ctypes.c_int]
 libadb.adb_search_add_operator.restype = ctypes.c_int
+libadb.adb_search_add_operator.errcheck = _check_status
+_adb_search_add_operator = libadb.adb_search_add_operator
 
 # int adb_search_add_comparator(struct adb_search *search, const char *field, enum adb_comparator comp, const char *value);
 libadb.adb_search_add_comparator.argtypes = [adb_search_p, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p]
 libadb.adb_search_add_comparator.restype = ctypes.c_int
+libadb.adb_search_add_comparator.errcheck = _check_status
+_adb_search_add_comparator = libadb.adb_search_add_comparator
+
+class adb_search_term(ctypes.Structure):
+    _fields_ = [
+        ("field", ctypes.c_char_p), # NULL for an operator term
+        ("comp", ctypes.c_int), # enum adb_comparator
+        ("value", ctypes.c_char_p),
+        ("op", ctypes.c_int), # enum adb_operator
+    ]
+
+# int adb_search_add_terms(struct adb_search *search, const struct adb_search_term *terms, int count);
+libadb.adb_search_add_terms.argtypes = [adb_search_p, ctypes.POINTER(adb_search_term), ctypes.c_int]
+libadb.adb_search_add_terms.restype = ctypes.c_int
+libadb.adb_search_add_terms.errcheck = _check_status
+_adb_search_add_terms = libadb.adb_search_add_terms
+
+class adb_search_box(ctypes.Structure):
+    _fields_ = [
+        ("ra_min", ctypes.c_double),
+        ("ra_max", ctypes.c_double),
+        ("dec_min", ctypes.c_double),
+        ("dec_max", ctypes.c_double),
+        ("mag_max", ctypes.c_float),
+    ]
+
+# int adb_search_add_box(struct adb_search *search, const struct adb_search_box *box);
+libadb.adb_search_add_box.argtypes = [adb_search_p, ctypes.POINTER(adb_search_box)]
+libadb.adb_search_add_box.restype = ctypes.c_int
+libadb.adb_search_add_box.errcheck = _check_status
+_adb_search_add_box = libadb.adb_search_add_box
+
+# int adb_search_add_cone(struct adb_search *search, double ra, double dec, double radius);
+libadb.adb_search_add_cone.argtypes = [adb_search_p, ctypes.c_double, ctypes.c_double, ctypes.c_double]
+libadb.adb_search_add_cone.restype = ctypes.c_int
+libadb.adb_search_add_cone.errcheck = _check_status
+_adb_search_add_cone = libadb.adb_search_add_cone
 
 adb_custom_comparator = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p)
 
 # int adb_search_add_custom_comparator(struct adb_search *search, adb_custom_comparator comp);
 libadb.adb_search_add_custom_comparator.argtypes = [adb_search_p, adb_custom_comparator]
 libadb.adb_search_add_custom_comparator.restype = ctypes.c_int
+libadb.adb_search_add_custom_comparator.errcheck = _check_status
+_adb_search_add_custom_comparator = libadb.adb_search_add_custom_comparator
 
 # int adb_search_get_results(struct adb_search *search, struct adb_object_set *set, const struct adb_object **objects[]);
 libadb.adb_search_get_results.argtypes = [adb_search_p, adb_object_set_p, ctypes.c_void_p]
 libadb.adb_search_get_results.restype = ctypes.c_int
+libadb.adb_search_get_results.errcheck = _check_status
+_adb_search_get_results = libadb.adb_search_get_results
+
+# int adb_search_get_results_packed(struct adb_search *search, struct adb_object_set *set, const void **objects, int *count);
+libadb.adb_search_get_results_packed.argtypes = [adb_search_p, adb_object_set_p, ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_int)]
+libadb.adb_search_get_results_packed.restype = ctypes.c_int
+libadb.adb_search_get_results_packed.errcheck = _check_status
+_adb_search_get_results_packed = libadb.adb_search_get_results_packed
 
 # int adb_search_get_hits(struct adb_search *search);
 libadb.adb_search_get_hits.argtypes = [adb_search_p]
 libadb.adb_search_get_hits.restype = ctypes.c_int
+_adb_search_get_hits = libadb.adb_search_get_hits
 
 # int adb_search_get_tests(struct adb_search *search);
 libadb.adb_search_get_tests.argtypes = [adb_search_p]
 libadb.adb_search_get_tests.restype = ctypes.c_int
+_adb_search_get_tests = libadb.adb_search_get_tests
 
 
 ### Import Bindings ###
@@ -277,41 +458,87 @@ class adb_schema_field(ctypes.Structure):
         ("import_cb", adb_field_import1),
     ]
 
+def adb_offset(cls, field: str) -> int:
+    """Byte offset of field within a ctypes structure, as the C adb_offset() macro."""
+    return getattr(cls, field).offset
+
+def adb_sizeof(cls, field: str) -> int:
+    """Byte size of field within a ctypes structure, as the C adb_sizeof() macro."""
+    return getattr(cls, field).size
+
+def adb_set_member(schema, i: int, name: bytes, symbol: bytes, offset: int, size: int,
+                   ctype: int, units: bytes, group_posn: int, import_cb=None):
+    """Fill schema[i] in place, equivalent to the C adb_member() initialiser.
+
+    schema is a preallocated (adb_schema_field * N)() array so no intermediate
+    Structure is created or copied. Strings are passed pre-encoded as bytes.
+    """
+    field = schema[i]
+    field.name = name
+    field.symbol = symbol
+    field.struct_offset = offset
+    field.struct_bytes = size
+    field.type = ctype
+    field.units = units
+    field.group_posn = group_posn
+    if import_cb is not None:
+        field.import_cb = import_cb
+
+def adb_set_gmember(schema, i: int, name: bytes, symbol: bytes, offset: int, size: int,
+                    ctype: int, units: bytes, group_posn: int, import_cb=None):
+    """Fill schema[i] in place, equivalent to the C adb_gmember() initialiser."""
+    adb_set_member(schema, i, name, symbol, offset, size, ctype, units, group_posn, import_cb)
+    schema[i].group_offset = offset
+
 # int adb_table_import_new(struct adb_db *db, const char *cat_class, const char *cat_id, const char *table_name, const char *depth_field, float min_limit, float max_limit, adb_import_type otype);
 libadb.adb_table_import_new.argtypes = [adb_db_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_float, ctypes.c_float, ctypes.c_int]
 libadb.adb_table_import_new.restype = ctypes.c_int
+libadb.adb_table_import_new.errcheck = _check_status
+_adb_table_import_new = libadb.adb_table_import_new
 
 # int adb_table_import_schema(struct adb_db *db, int table_id, struct adb_schema_field *schema, int num_schema_fields, int object_size);
 libadb.adb_table_import_schema.argtypes = [adb_db_p, ctypes.c_int, ctypes.POINTER(adb_schema_field), ctypes.c_int, ctypes.c_int]
 libadb.adb_table_import_schema.restype = ctypes.c_int
+libadb.adb_table_import_schema.errcheck = _check_status
+_adb_table_import_schema = libadb.adb_table_import_schema
 
 # int adb_table_import_field(struct adb_db *db, int table_id, const char *field, const char *alt, int flags);
 libadb.adb_table_import_field.argtypes = [adb_db_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int]
 libadb.adb_table_import_field.restype = ctypes.c_int
+libadb.adb_table_import_field.errcheck = _check_status
+_adb_table_import_field = libadb.adb_table_import_field
 
 # int adb_table_import(struct adb_db *db, int table_id);
 libadb.adb_table_import.argtypes = [adb_db_p, ctypes.c_int]
 libadb.adb_table_import.restype = ctypes.c_int
+libadb.adb_table_import.errcheck = _check_status
+_adb_table_import = libadb.adb_table_import
 
 # adb_ctype adb_table_get_field_type(struct adb_db *db, int table_id, const char *field);
 libadb.adb_table_get_field_type.argtypes = [adb_db_p, ctypes.c_int, ctypes.c_char_p]
 libadb.adb_table_get_field_type.restype = ctypes.c_int
+_adb_table_get_field_type = libadb.adb_table_get_field_type
 
 # int adb_table_get_field_offset(struct adb_db *db, int table_id, const char *field);
 libadb.adb_table_get_field_offset.argtypes = [adb_db_p, ctypes.c_int, ctypes.c_char_p]
 libadb.adb_table_get_field_offset.restype = ctypes.c_int
+_adb_table_get_field_offset = libadb.adb_table_get_field_offset
 
 # int adb_table_import_alt_dataset(struct adb_db *db, int table_id, const char *dataset, int num_objects);
 libadb.adb_table_import_alt_dataset.argtypes = [adb_db_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_int]
 libadb.adb_table_import_alt_dataset.restype = ctypes.c_int
+libadb.adb_table_import_alt_dataset.errcheck = _check_status
+_adb_table_import_alt_dataset = libadb.adb_table_import_alt_dataset
 
 # void adb_set_msg_level(struct adb_db *db, enum adb_msg_level level);
 libadb.adb_set_msg_level.argtypes = [adb_db_p, ctypes.c_int]
 libadb.adb_set_msg_level.restype = None
+_adb_set_msg_level = libadb.adb_set_msg_level
 
 # void adb_set_log_level(struct adb_db *db, unsigned int log);
 libadb.adb_set_log_level.argtypes = [adb_db_p, ctypes.c_uint]
 libadb.adb_set_log_level.restype = None
+_adb_set_log_level = libadb.adb_set_log_level
 
 
 ### Solver Bindings ###
@@ -340,64 +567,93 @@ ADB_BOUND_CENTRE = 4
 # struct adb_solve *adb_solve_new(struct adb_db *db, int table_id);
 libadb.adb_solve_new.argtypes = [adb_db_p, ctypes.c_int]
 libadb.adb_solve_new.restype = adb_solve_p
+_adb_solve_new = libadb.adb_solve_new
 
 # void adb_solve_free(struct adb_solve *solve);
 libadb.adb_solve_free.argtypes = [adb_solve_p]
 libadb.adb_solve_free.restype = None
+_adb_solve_free = libadb.adb_solve_free
 
 # int adb_solve_set_magnitude_delta(struct adb_solve *solve, double delta_mag);
 libadb.adb_solve_set_magnitude_delta.argtypes = [adb_solve_p, ctypes.c_double]
 libadb.adb_solve_set_magnitude_delta.restype = ctypes.c_int
+libadb.adb_solve_set_magnitude_delta.errcheck = _check_status
+_adb_solve_set_magnitude_delta = libadb.adb_solve_set_magnitude_delta
 
 # int adb_solve_set_distance_delta(struct adb_solve *solve, double delta_pixels);
 libadb.adb_solve_set_distance_delta.argtypes = [adb_solve_p, ctypes.c_double]
 libadb.adb_solve_set_distance_delta.restype = ctypes.c_int
+libadb.adb_solve_set_distance_delta.errcheck = _check_status
+_adb_solve_set_distance_delta = libadb.adb_solve_set_distance_delta
 
 # int adb_solve_set_pa_delta(struct adb_solve *solve, double delta_degrees);
 libadb.adb_solve_set_pa_delta.argtypes = [adb_solve_p, ctypes.c_double]
 libadb.adb_solve_set_pa_delta.restype = ctypes.c_int
+libadb.adb_solve_set_pa_delta.errcheck = _check_status
+_adb_solve_set_pa_delta = libadb.adb_solve_set_pa_delta
 
 # int adb_solve_add_plate_object(struct adb_solve *solve, struct adb_pobject *pobject);
 libadb.adb_solve_add_plate_object.argtypes = [adb_solve_p, ctypes.POINTER(adb_pobject)]
 libadb.adb_solve_add_plate_object.restype = ctypes.c_int
+libadb.adb_solve_add_plate_object.errcheck = _check_status
+_adb_solve_add_plate_object = libadb.adb_solve_add_plate_object
 
 # int adb_solve_constraint(struct adb_solve *solve, enum adb_constraint type, double min, double max);
 libadb.adb_solve_constraint.argtypes = [adb_solve_p, ctypes.c_int, ctypes.c_double, ctypes.c_double]
 libadb.adb_solve_constraint.restype = ctypes.c_int
+libadb.adb_solve_constraint.errcheck = _check_status
+_adb_solve_constraint = libadb.adb_solve_constraint
 
 # int adb_solve(struct adb_solve *solve, struct adb_object_set *set, enum adb_find find);
 libadb.adb_solve.argtypes = [adb_solve_p, adb_object_set_p, ctypes.c_int]
 libadb.adb_solve.restype = ctypes.c_int
+libadb.adb_solve.errcheck = _check_status
+_adb_solve = libadb.adb_solve
 
 # struct adb_solve_solution *adb_solve_get_solution(struct adb_solve *solve, unsigned int solution);
 libadb.adb_solve_get_solution.argtypes = [adb_solve_p, ctypes.c_uint]
 libadb.adb_solve_get_solution.restype = adb_solve_solution_p
+_adb_solve_get_solution = libadb.adb_solve_get_solution
 
 # int adb_solution_get_objects(struct adb_solve_solution *solution);
 libadb.adb_solution_get_objects.argtypes = [adb_solve_solution_p]
 libadb.adb_solution_get_objects.restype = ctypes.c_int
+_adb_solution_get_objects = libadb.adb_solution_get_objects
 
 # double adb_solution_divergence(struct adb_solve_solution *solution);
 libadb.adb_solution_divergence.argtypes = [adb_solve_solution_p]
 libadb.adb_solution_divergence.restype = ctypes.c_double
+_adb_solution_divergence = libadb.adb_solution_divergence
 
 # struct adb_solve_object *adb_solution_get_object(struct adb_solve_solution *solution, int index);
 libadb.adb_solution_get_object.argtypes = [adb_solve_solution_p, ctypes.c_int]
 libadb.adb_solution_get_object.restype = adb_solve_object_p
+_adb_solution_get_object = libadb.adb_solution_get_object
 
 # double adb_solution_get_pixel_size(struct adb_solve_solution *solution);
 libadb.adb_solution_get_pixel_size.argtypes = [adb_solve_solution_p]
 libadb.adb_solution_get_pixel_size.restype = ctypes.c_double
+_adb_solution_get_pixel_size = libadb.adb_solution_get_pixel_size
 
 # void adb_solution_get_plate_equ_bounds(struct adb_solve_solution *solution, enum adb_plate_bounds bounds, double *ra, double *dec);
 libadb.adb_solution_get_plate_equ_bounds.argtypes = [adb_solve_solution_p, ctypes.c_int, ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double)]
 libadb.adb_solution_get_plate_equ_bounds.restype = None
+_adb_solution_get_plate_equ_bounds = libadb.adb_solution_get_plate_equ_bounds
 
 # void adb_solution_plate_to_equ_position(struct adb_solve_solution *solution, int x, int y, double *ra, double *dec);
 libadb.adb_solution_plate_to_equ_position.argtypes = [adb_solve_solution_p, ctypes.c_int, ctypes.c_int, ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double)]
 libadb.adb_solution_plate_to_equ_position.restype = None
+_adb_solution_plate_to_equ_position = libadb.adb_solution_plate_to_equ_position
 
 # void adb_solution_equ_to_plate_position(struct adb_solve_solution *solution, double ra, double dec, double *x, double *y);
 libadb.adb_solution_equ_to_plate_position.argtypes = [adb_solve_solution_p, ctypes.c_double, ctypes.c_double, ctypes.POINTER(ctypes.c_double), ctypes.POINTER(ctypes.c_double)]
 libadb.adb_solution_equ_to_plate_position.restype = None
+_adb_solution_equ_to_plate_position = libadb.adb_solution_equ_to_plate_position
+
 
+# every cached handle must carry its prototype, without argtypes ctypes
+# guesses the conversion of each argument on every call
+for _name, _fn in list(globals().items()):
+    if _name.startswith('_adb_'):
+        assert _fn.argtypes is not None, f"{_name[1:]} has no argtypes"
+del _name, _fn
@@ -0,0 +1,109 @@
+"""Declarative catalogue schemas.
+
+A schema is written as a list of Field entries naming the member of the
+catalogue object each column is imported into, e.g. "object.ra" for the
+ra member of an embedded struct adb_object. build_schema() resolves the
+paths and fills the (adb_schema_field * N) array for Table.import_schema()
+in one pass.
+"""
+import ctypes
+import functools
+import struct
+from dataclasses import dataclass
+from typing import Callable, Optional, Union
+
+from .lib import (
+    adb_schema_field,
+    ADB_SCHEMA_NAME_SIZE,
+    ADB_SCHEMA_SYMBOL_SIZE,
+    ADB_SCHEMA_UNITS_SIZE,
+)
+
+# native layout of struct adb_schema_field: name, symbol, struct_offset,
+# struct_bytes, group_offset, group_posn, text_size, text_offset, type,
+# units and import_cb. Unused bytes are left zero as in the C initialisers.
+_ENTRY = struct.Struct('@%ds%ds7i%dsP' % (
+    ADB_SCHEMA_NAME_SIZE, ADB_SCHEMA_SYMBOL_SIZE, ADB_SCHEMA_UNITS_SIZE))
+_ENTRY_SIZE = ctypes.sizeof(adb_schema_field)
+
+
+@functools.lru_cache(maxsize=None)
+def _intern(s: Union[str, bytes]) -> bytes:
+    # labels such as "degrees" repeat across fields, share one bytes object
+    return s.encode('utf-8') if isinstance(s, str) else s
+
+
+@dataclass
+class Field:
+    """One catalogue column, see adb_member() and adb_gmember() in C.
+
+    name, symbol and units may be str or bytes, they are stored encoded
+    and must leave room for the NUL in their C char arrays.
+    """
+    name: Union[str, bytes]
+    symbol: Union[str, bytes]
+    path: str
+    ctype: int
+    units: Union[str, bytes] = b''
+    group_posn: int = 0
+    group: bool = False
+    import_cb: Optional[Callable] = None
+
+    def __post_init__(self):
+        self.name = _intern(self.name)
+        self.symbol = _intern(self.symbol)
+        self.units = _intern(self.units)
+        # the packed image truncates silently and C reads these as strings
+        for label, size in (('name', ADB_SCHEMA_NAME_SIZE),
+                            ('symbol', ADB_SCHEMA_SYMBOL_SIZE),
+                            ('units', ADB_SCHEMA_UNITS_SIZE)):
+            if len(getattr(self, label)) >= size:
+                raise ValueError(f"{label} {getattr(self, label)!r} is too long, "
+                                 f"at most {size - 1} bytes")
+
+
+@functools.lru_cache(maxsize=None)
+def _resolve(cls, path: str):
+    """(offset, size) of a dotted member path within ctypes structure cls."""
+    *parents, name = path.split('.')
+    offset = 0
+    for part in parents:
+        offset += getattr(cls, part).offset
+        cls = next(f[1] for f in cls._fields_ if f[0] == part)
+    member = getattr(cls, name)
+    return offset + member.offset, member.size
+
+
+# filled schema images and their fields by structure and field contents,
+# holding the fields keeps the import callbacks in the images alive
+_images = {}
+
+def _field_key(f: Field):
+    # ctypes callbacks are unhashable, they are told apart by identity
+    return (f.name, f.symbol, f.path, f.ctype, f.units, f.group_posn, f.group, id(f.import_cb))
+
+def build_schema(cls, fields: list) -> ctypes.Array:
+    """Build the schema array for catalogue object structure cls.
+
+    A schema is constant for a given structure and field list, so it is
+    filled once and later calls copy the saved image into a new array.
+    """
+    key = (cls, tuple(map(_field_key, fields)))
+    schema_type = adb_schema_field * len(fields)
+    cached = _images.get(key)
+    if cached is not None:
+        return schema_type.from_buffer_copy(cached[0])
+
+    # pack every entry into one buffer and copy it into the array once,
+    # each ctypes member assignment would otherwise cost a Python call
+    image = bytearray(_ENTRY_SIZE * len(fields))
+    for i, f in enumerate(fields):
+        offset, size = _resolve(cls, f.path)
+        cb = 0
+        if f.import_cb is not None:
+            cb = ctypes.cast(f.import_cb, ctypes.c_void_p).value
+        _ENTRY.pack_into(image, i * _ENTRY_SIZE, f.name, f.symbol, offset, size,
+                         offset if f.group else 0, f.group_posn, 0, 0,
+                         f.ctype, f.units, cb)
+    _images[key] = (bytes(image), tuple(fields))
+    return schema_type.from_buffer_copy(image)
@@ -0,0 +1,131 @@
+"""Vectorised post-processing kernels for search and object set results.
+
+These work on the plain float64 RA/DEC columns of the arrays returned by
+ObjectSet.to_numpy() and Search.to_numpy(). Numba is used when installed,
+compiling each kernel to a single parallel loop with no temporaries,
+otherwise the same maths runs as a NumPy expression.
+"""
+import math
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+try:
+    from numba import cuda
+except ImportError:
+    cuda = None
+
+# below this many objects host <-> device copies cost more than the kernel
+_CUDA_MIN_OBJECTS = 1 << 20
+# objects per device transfer, bounds GPU memory use for big catalogues
+_CUDA_CHUNK = 1 << 22
+
+if numba is not None:
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _great_circle(ra, dec, ra0, dec0):
+        n = ra.shape[0]
+        out = np.empty(n)
+        cos_dec0 = math.cos(dec0)
+        for i in numba.prange(n):
+            s_dec = math.sin((dec[i] - dec0) * 0.5)
+            s_ra = math.sin((ra[i] - ra0) * 0.5)
+            h = s_dec * s_dec + math.cos(dec[i]) * cos_dec0 * s_ra * s_ra
+            out[i] = 2.0 * math.asin(math.sqrt(min(h, 1.0)))
+        return out
+
+    # d < r is tested as hav(d) < hav(r), no inverse trig per object
+    @numba.njit(parallel=True, fastmath=True, cache=True)
+    def _within(ra, dec, ra0, dec0, hav_r):
+        n = ra.shape[0]
+        out = np.empty(n, dtype=np.bool_)
+        cos_dec0 = math.cos(dec0)
+        for i in numba.prange(n):
+            s_dec = math.sin((dec[i] - dec0) * 0.5)
+            s_ra = math.sin((ra[i] - ra0) * 0.5)
+            out[i] = s_dec * s_dec + math.cos(dec[i]) * cos_dec0 * s_ra * s_ra < hav_r
+        return out
+else:
+    def _great_circle(ra, dec, ra0, dec0):
+        s_dec = np.sin((dec - dec0) * 0.5)
+        s_ra = np.sin((ra - ra0) * 0.5)
+        h = s_dec * s_dec + np.cos(dec) * math.cos(dec0) * s_ra * s_ra
+        return 2.0 * np.arcsin(np.sqrt(np.minimum(h, 1.0)))
+
+    def _within(ra, dec, ra0, dec0, hav_r):
+        s_dec = np.sin((dec - dec0) * 0.5)
+        s_ra = np.sin((ra - ra0) * 0.5)
+        return s_dec * s_dec + np.cos(dec) * math.cos(dec0) * s_ra * s_ra < hav_r
+
+if cuda is not None:
+    @cuda.jit
+    def _within_kernel(ra, dec, ra0, dec0, hav_r, out):
+        i = cuda.grid(1)
+        if i < ra.size:
+            s_dec = math.sin((dec[i] - dec0) * 0.5)
+            s_ra = math.sin((ra[i] - ra0) * 0.5)
+            out[i] = s_dec * s_dec + math.cos(dec[i]) * math.cos(dec0) * s_ra * s_ra < hav_r
+
+    def _within_cuda(ra, dec, ra0, dec0, hav_r):
+        # stream the columns through the GPU a chunk at a time, the inputs
+        # and result are staged in page locked memory so the copies in both
+        # directions run async on the stream
+        n = ra.shape[0]
+        h_ra = cuda.pinned_array(n, dtype=np.float64)
+        h_dec = cuda.pinned_array(n, dtype=np.float64)
+        h_ra[:] = ra
+        h_dec[:] = dec
+        out = cuda.pinned_array(n, dtype=np.bool_)
+        stream = cuda.stream()
+        for start in range(0, n, _CUDA_CHUNK):
+            end = min(start + _CUDA_CHUNK, n)
+            d_ra = cuda.to_device(h_ra[start:end], stream=stream)
+            d_dec = cuda.to_device(h_dec[start:end], stream=stream)
+            d_out = cuda.device_array(end - start, dtype=np.bool_, stream=stream)
+            blocks = (end - start + 255) // 256
+            _within_kernel[blocks, 256, stream](d_ra, d_dec, ra0, dec0, hav_r, d_out)
+            d_out.copy_to_host(out[start:end], stream=stream)
+        stream.synchronize()
+        return np.asarray(out)
+
+def cuda_available() -> bool:
+    """True when numba.cuda is installed and can see a GPU."""
+    return cuda is not None and cuda.is_available()
+
+def great_circle(ra, dec, ra0: float, dec0: float) -> np.ndarray:
+    """Angular distance in radians from (ra0, dec0) to each (ra, dec).
+
+    All angles are in radians. The haversine form is used so small
+    separations keep their precision, e.g.
+    great_circle(arr['ra'], arr['dec'], ra0, dec0) < radius.
+    """
+    ra = np.asarray(ra, dtype=np.float64)
+    dec = np.asarray(dec, dtype=np.float64)
+    return _great_circle(ra, dec, float(ra0), float(dec0))
+
+def within_radius(ra, dec, ra0: float, dec0: float, radius: float, use_cuda: bool = None) -> np.ndarray:
+    """Boolean mask of the (ra, dec) positions closer than radius to (ra0, dec0).
+
+    All angles are in radians. With use_cuda left as None the GPU is used
+    when one is available and there are enough objects to pay for the
+    transfers, otherwise the CPU kernel runs. Passing use_cuda=True without
+    a usable GPU raises RuntimeError, a negative or non-finite radius
+    raises ValueError.
+    """
+    radius = float(radius)
+    # the haversine squares away the sign, reject like adb_search_add_cone()
+    if not math.isfinite(radius) or radius < 0.0:
+        raise ValueError(f"radius must be finite and >= 0, got {radius!r}")
+    ra = np.asarray(ra, dtype=np.float64)
+    dec = np.asarray(dec, dtype=np.float64)
+    hav_r = math.sin(min(radius, math.pi) * 0.5) ** 2
+    if use_cuda is None:
+        use_cuda = ra.shape[0] >= _CUDA_MIN_OBJECTS and cuda_available()
+    if use_cuda:
+        if not cuda_available():
+            raise RuntimeError("use_cuda requested but numba.cuda can't see a GPU")
+        return _within_cuda(ra, dec, float(ra0), float(dec0), hav_r)
+    return _within(ra, dec, float(ra0), float(dec0), hav_r)
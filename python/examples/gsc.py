@@ -1,13 +1,32 @@
 import sys
 import time
-import math
+import ctypes
 from astrodb import (
     Library, Database, Table, ObjectSet, Search, AstroDBError,
-    ADB_COMP_LT, ADB_COMP_GT, ADB_OP_AND, ADB_OP_OR
+    D2R, R2D, TWO_PI,
+    AdbOp, AdbComp
 )
+from astrodb.lib import (
+    ADB_CTYPE_STRING, ADB_CTYPE_DEGREES, ADB_CTYPE_FLOAT,
+    ADB_IMPORT_INC, adb_object
+)
+from astrodb.schema import Field, build_schema
+
+class gsc_object(ctypes.Structure):
+    _fields_ = [
+        ("object", adb_object),
+        ("pos_err", ctypes.c_float),
+        ("pmag_err", ctypes.c_float),
+    ]
 
-D2R = 1.7453292519943295769e-2
-R2D = 5.7295779513082320877e1
+gsc_fields = build_schema(gsc_object, [
+    Field("Designation", "GSC", "object.designation", ADB_CTYPE_STRING),
+    Field("RA", "RAdeg", "object.ra", ADB_CTYPE_DEGREES, "degrees", 1),
+    Field("DEC", "DEdeg", "object.dec", ADB_CTYPE_DEGREES, "degrees", 1),
+    Field("Photographic Mag", "Pmag", "object.mag", ADB_CTYPE_FLOAT),
+    Field("Mag error", "e_Pmag", "pmag_err", ADB_CTYPE_FLOAT),
+    Field("Pos error", "PosErr", "pos_err", ADB_CTYPE_FLOAT),
+])
 
 def print_objects(oset):
     for obj in oset:
@@ -22,7 +41,7 @@ def get_all(db, table_name, print_out=False):
     try:
         tbl = Table(db, "I", "254", table_name)
         oset = ObjectSet(tbl)
-        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, 0.0, 16.0)
+        oset.apply_constraints(0.0, 0.0, TWO_PI, 0.0, 16.0)
         oset.populate()
         
         print(f" found {len(oset)} list heads {len(oset)} objects\n")
@@ -41,15 +60,8 @@ def search1(db, table_name, print_out=False):
         search = Search(tbl)
         oset = ObjectSet(tbl)
         
-        search.add_comparator("DEdeg", ADB_COMP_LT, "58.434773")
-        search.add_comparator("DEdeg", ADB_COMP_GT, "57.678541")
-        search.add_operator(ADB_OP_AND)
-        
-        search.add_comparator("RAdeg", ADB_COMP_LT, "342.434232")
-        search.add_comparator("RAdeg", ADB_COMP_GT, "341.339925")
-        search.add_operator(ADB_OP_AND)
-        
-        search.add_operator(ADB_OP_AND)
+        search.add_box(341.339925 * D2R, 342.434232 * D2R,
+                       57.678541 * D2R, 58.434773 * D2R)
         
         start_t = time.time()
         search.execute(oset)
@@ -73,12 +85,39 @@ def search1(db, table_name, print_out=False):
     except AstroDBError as e:
         print(f"Search failed: {e}")
 
+def filter1(db, table_name, print_out=False):
+    print("Filtering objects with numpy")
+    try:
+        tbl = Table(db, "I", "254", table_name)
+        oset = ObjectSet(tbl)
+        oset.apply_constraints(0.0, 0.0, TWO_PI, 0.0, 16.0)
+        oset.populate()
+        
+        # same box as search1, as vectorised masks over the populated set
+        start_t = time.time()
+        hits = oset.filter_numpy(dec_between=(57.678541 * D2R, 58.434773 * D2R),
+                                 ra_between=(341.339925 * D2R, 342.434232 * D2R))
+        secs = time.time() - start_t
+        
+        print(f"   Time {secs * 1000.0:3.1f} msecs")
+        print(f"   Filter got {len(hits)} objects\n")
+        
+        if print_out:
+            for obj in hits:
+                print(f"Obj: {obj['designation'].decode('utf-8')} RA: {obj['ra'] * R2D:f} DEC: {obj['dec'] * R2D:f} Mag {obj['mag']:3.2f}")
+        
+        oset.close()
+        tbl.close()
+    except AstroDBError as e:
+        print(f"Filter failed: {e}")
+
 def gsc_query(lib_dir, print_out=False):
     try:
         lib = Library("cdsarc.u-strasbg.fr", "/pub/cats", lib_dir)
         db = Database(lib, 9, 1)
         
         search1(db, "gsc", print_out)
+        filter1(db, "gsc", print_out)
         get_all(db, "gsc", print_out)
         
         db.close()
@@ -91,16 +130,9 @@ def gsc_import(lib_dir):
         lib = Library("cdsarc.u-strasbg.fr", "/pub/cats", lib_dir)
         db = Database(lib, 9, 1)
         
-        tbl = Table.import_new(db, "I", "254", "out", "Pmag", -2.0, 17.0)
+        tbl = Table.import_new(db, "I", "254", "out", "Pmag", -2.0, 17.0, ADB_IMPORT_INC)
         tbl.import_alt_dataset("gsc", 0)
-        
-        # Add GSC schema layout equivalent
-        tbl.import_field("Designation", "GSC", libadb.ADB_CTYPE_STRING, "", 0)
-        tbl.import_field("RA", "RAdeg", libadb.ADB_CTYPE_DEGREES, "degrees", 1)
-        tbl.import_field("DEC", "DEdeg", libadb.ADB_CTYPE_DEGREES, "degrees", 1)
-        tbl.import_field("Photographic Mag", "Pmag", libadb.ADB_CTYPE_FLOAT, "", 0)
-        tbl.import_field("Mag error", "e_Pmag", libadb.ADB_CTYPE_FLOAT, "", 0)
-        tbl.import_field("Pos error", "PosErr", libadb.ADB_CTYPE_FLOAT, "", 0)
+        tbl.import_schema(gsc_fields, ctypes.sizeof(gsc_object))
         
         tbl.run_import()
         tbl.close()
@@ -7,7 +7,7 @@ import gi
 
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk, Gio, GObject, GLib, Pango
-from astrodb import Library, Database, Table, ObjectSet, Search, AstroDBError, ADB_COMP_LT, ADB_COMP_GT, ADB_OP_AND, ADB_OP_OR
+from astrodb import Library, Database, Table, ObjectSet, Search, AstroDBError, AdbOp, AdbComp, R2D
 
 class CatalogItem(GObject.Object):
     __gtype_name__ = 'CatalogItem'
@@ -525,28 +525,26 @@ class AstroDBWindow(Gtk.ApplicationWindow):
             has_constraints = False
             
             if ra_min:
-                search.add_comparator("RAdeg", ADB_COMP_GT, ra_min)
+                search.add_comparator("RAdeg", AdbComp.GT, ra_min)
                 has_constraints = True
             if ra_max:
-                search.add_comparator("RAdeg", ADB_COMP_LT, ra_max)
-                if has_constraints: search.add_operator(ADB_OP_AND)
+                search.add_comparator("RAdeg", AdbComp.LT, ra_max)
+                if has_constraints: search.add_operator(AdbOp.AND)
                 has_constraints = True
             
             if dec_min:
-                search.add_comparator("DEdeg", ADB_COMP_GT, dec_min)
-                if has_constraints: search.add_operator(ADB_OP_AND)
+                search.add_comparator("DEdeg", AdbComp.GT, dec_min)
+                if has_constraints: search.add_operator(AdbOp.AND)
                 has_constraints = True
             if dec_max:
-                search.add_comparator("DEdeg", ADB_COMP_LT, dec_max)
-                if has_constraints: search.add_operator(ADB_OP_AND)
+                search.add_comparator("DEdeg", AdbComp.LT, dec_max)
+                if has_constraints: search.add_operator(AdbOp.AND)
                 has_constraints = True
 
             if has_constraints:
                 hits = search.execute(oset)
                 self.query_status.set_text(f"Found {hits} objects. Generating results...")
                 
-                R2D = 57.295779513082320877
-                
                 for obj in search:
                     desig = obj.designation
                     if isinstance(desig, bytes):
@@ -1,18 +1,152 @@
 import sys
 import math
+import ctypes
 from astrodb import (
     Library, Database, Table, ObjectSet, AstroDBError,
-    ADB_COMP_LT, ADB_COMP_GT, ADB_OP_AND, ADB_OP_OR
+    R2D, TWO_PI,
+    AdbOp, AdbComp
 )
 from astrodb.lib import (
     ADB_CTYPE_STRING, ADB_CTYPE_INT, ADB_CTYPE_DOUBLE_HMS_HRS,
     ADB_CTYPE_DOUBLE_HMS_MINS, ADB_CTYPE_DOUBLE_HMS_SECS,
     ADB_CTYPE_DOUBLE_DMS_DEGS, ADB_CTYPE_DOUBLE_DMS_MINS,
-    ADB_CTYPE_DOUBLE_DMS_SECS, ADB_CTYPE_SIGN, ADB_CTYPE_FLOAT
+    ADB_CTYPE_DOUBLE_DMS_SECS, ADB_CTYPE_SIGN, ADB_CTYPE_FLOAT,
+    ADB_IMPORT_INC, adb_object, adb_field_import1
 )
+from astrodb.schema import Field, build_schema
 
-D2R = 1.7453292519943295769e-2
-R2D = 5.7295779513082320877e1
+class hyperleda_object(ctypes.Structure):
+    _fields_ = [
+        ("d", adb_object),
+        ("position_angle", ctypes.c_float),
+        ("axis_ratio", ctypes.c_float),
+        ("MType", ctypes.c_char * 4),
+        ("OType", ctypes.c_char * 1),
+        ("other_name", ctypes.c_char * 15),
+    ]
+
+# The fallback callbacks store through from_address() views so no
+# POINTER() objects are created per row.
+@adb_field_import1
+def pa_insert(obj_ptr, offset, src):
+    dest = ctypes.c_float.from_address(ctypes.addressof(obj_ptr.contents) + offset)
+    try:
+        val = float(src)
+    except ValueError:
+        dest.value = math.nan
+        return -1
+    dest.value = math.nan if val == 999.0 else val
+    return 0
+
+@adb_field_import1
+def size_insert(obj_ptr, offset, src):
+    dest = ctypes.c_float.from_address(ctypes.addressof(obj_ptr.contents) + offset)
+    try:
+        val = float(src)
+    except ValueError:
+        dest.value = math.nan
+        return -1
+    dest.value = math.nan if val == 9.99 else val
+    return 0
+
+@adb_field_import1
+def otype_insert(obj_ptr, offset, src):
+    dest = ctypes.c_char.from_address(ctypes.addressof(obj_ptr.contents) + offset)
+    if src[:1] == b"M":
+        dest.value = b"M"
+    elif src[:1] == b"G":
+        dest.value = b"X" if src[1:2] == b"M" else b"G"
+    return 0
+
+# The callbacks above run once per imported row. When numba is available
+# replace them with native cfuncs so the C import loop calls straight into
+# machine code without taking the GIL or building Python objects per row.
+try:
+    import numba
+    from numba import types
+except ImportError:
+    numba = None
+
+if numba is not None:
+    _SPACE, _PLUS, _MINUS, _POINT, _ZERO, _NINE = (ord(c) for c in " +-.09")
+    _M, _G, _X = ord("M"), ord("G"), ord("X")
+
+    @numba.njit(cache=True)
+    def _parse_float(src):
+        # strtof() subset for fixed format CDS columns: [spaces][sign]digits[.digits]
+        i = 0
+        while src[i] == _SPACE:
+            i += 1
+        neg = src[i] == _MINUS
+        if neg or src[i] == _PLUS:
+            i += 1
+        mant = 0
+        scale = 1.0
+        digits = 0
+        while _ZERO <= src[i] <= _NINE:
+            mant = mant * 10 + (src[i] - _ZERO)
+            digits += 1
+            i += 1
+        if src[i] == _POINT:
+            i += 1
+            while _ZERO <= src[i] <= _NINE:
+                mant = mant * 10 + (src[i] - _ZERO)
+                scale *= 10.0
+                digits += 1
+                i += 1
+        val = mant / scale
+        return -val if neg else val, digits
+
+    # object is addressed as a float array, float fields are 4 byte aligned
+    _float_sig = types.int32(types.CPointer(types.float32), types.int32, types.CPointer(types.uint8))
+    _char_sig = types.int32(types.CPointer(types.uint8), types.int32, types.CPointer(types.uint8))
+
+    @numba.cfunc(_float_sig, cache=True)
+    def _pa_insert_native(obj, offset, src):
+        val, digits = _parse_float(src)
+        if digits == 0:
+            obj[offset >> 2] = math.nan
+            return -1
+        obj[offset >> 2] = math.nan if val == 999.0 else val
+        return 0
+
+    @numba.cfunc(_float_sig, cache=True)
+    def _size_insert_native(obj, offset, src):
+        val, digits = _parse_float(src)
+        if digits == 0:
+            obj[offset >> 2] = math.nan
+            return -1
+        obj[offset >> 2] = math.nan if val == 9.99 else val
+        return 0
+
+    @numba.cfunc(_char_sig, cache=True)
+    def _otype_insert_native(obj, offset, src):
+        if src[0] == _M:
+            obj[offset] = _M
+        elif src[0] == _G:
+            obj[offset] = _X if src[1] == _M else _G
+        return 0
+
+    pa_insert = adb_field_import1(_pa_insert_native.address)
+    size_insert = adb_field_import1(_size_insert_native.address)
+    otype_insert = adb_field_import1(_otype_insert_native.address)
+
+hyperleda_fields = build_schema(hyperleda_object, [
+    Field("Name", "ANames", "other_name", ADB_CTYPE_STRING),
+    Field("ID", "PGC", "d.id", ADB_CTYPE_INT),
+    Field("RA Hours", "RAh", "d.ra", ADB_CTYPE_DOUBLE_HMS_HRS, "hours", 2, group=True),
+    Field("RA Minutes", "RAm", "d.ra", ADB_CTYPE_DOUBLE_HMS_MINS, "minutes", 1, group=True),
+    Field("RA Seconds", "RAs", "d.ra", ADB_CTYPE_DOUBLE_HMS_SECS, "seconds", 0, group=True),
+    Field("DEC Degrees", "DEd", "d.dec", ADB_CTYPE_DOUBLE_DMS_DEGS, "degrees", 3, group=True),
+    Field("DEC Minutes", "DEm", "d.dec", ADB_CTYPE_DOUBLE_DMS_MINS, "minutes", 2, group=True),
+    Field("DEC Seconds", "DEs", "d.dec", ADB_CTYPE_DOUBLE_DMS_SECS, "seconds", 1, group=True),
+    Field("DEC sign", "DE-", "d.dec", ADB_CTYPE_SIGN, group=True),
+    Field("Type", "MType", "MType", ADB_CTYPE_STRING),
+    Field("OType", "OType", "OType", ADB_CTYPE_STRING, import_cb=otype_insert),
+    Field("Diameter", "logD25", "d.mag", ADB_CTYPE_FLOAT, "0.1amin", import_cb=size_insert),
+    Field("Axis Ratio", "logR25", "axis_ratio", ADB_CTYPE_FLOAT, "0.1amin", import_cb=size_insert),
+    Field("Position Angle", "PA", "position_angle", ADB_CTYPE_FLOAT, "deg", import_cb=pa_insert),
+])
 
 def print_objects(oset):
     for obj in oset:
@@ -23,7 +157,7 @@ def get1(db, table_id, print_out=False):
     try:
         tbl = Table(db, "VII", "237", "pgc")
         oset = ObjectSet(tbl)
-        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, -2.0, 16.0)
+        oset.apply_constraints(0.0, 0.0, TWO_PI, -2.0, 16.0)
         oset.populate()
         
         print(f" found {len(oset)} object list heads {len(oset)} objects\n")
@@ -56,23 +190,8 @@ def hyperleda_import(lib_dir):
         lib = Library("cdsarc.u-strasbg.fr", "/pub/cats", lib_dir)
         db = Database(lib, 7, 1)
         
-        tbl = Table.import_new(db, "VII", "237", "pgc", "logD25", 0.0, 2.0)
-        
-        # Add hyperleda schema layout equivalent
-        tbl.import_field("Name", "ANames", ADB_CTYPE_STRING, "", 0)
-        tbl.import_field("ID", "PGC", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("RA Hours", "RAh", ADB_CTYPE_DOUBLE_HMS_HRS, "hours", 2)
-        tbl.import_field("RA Minutes", "RAm", ADB_CTYPE_DOUBLE_HMS_MINS, "minutes", 1)
-        tbl.import_field("RA Seconds", "RAs", ADB_CTYPE_DOUBLE_HMS_SECS, "seconds", 0)
-        tbl.import_field("DEC Degrees", "DEd", ADB_CTYPE_DOUBLE_DMS_DEGS, "degrees", 3)
-        tbl.import_field("DEC Minutes", "DEm", ADB_CTYPE_DOUBLE_DMS_MINS, "minutes", 2)
-        tbl.import_field("DEC Seconds", "DEs", ADB_CTYPE_DOUBLE_DMS_SECS, "seconds", 1)
-        tbl.import_field("DEC sign", "DE-", ADB_CTYPE_SIGN, "", 0)
-        tbl.import_field("Type", "MType", ADB_CTYPE_STRING, "", 0)
-        tbl.import_field("OType", "OType", ADB_CTYPE_STRING, "", 0)
-        tbl.import_field("Diameter", "logD25", ADB_CTYPE_FLOAT, "0.1amin", 0)
-        tbl.import_field("Axis Ratio", "logR25", ADB_CTYPE_FLOAT, "0.1amin", 0)
-        tbl.import_field("Position Angle", "PA", ADB_CTYPE_FLOAT, "deg", 0)
+        tbl = Table.import_new(db, "VII", "237", "pgc", "logD25", 0.0, 2.0, ADB_IMPORT_INC)
+        tbl.import_schema(hyperleda_fields, ctypes.sizeof(hyperleda_object))
         
         tbl.run_import()
         tbl.close()
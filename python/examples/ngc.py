@@ -1,18 +1,38 @@
 import sys
-import math
+import ctypes
 from astrodb import (
     Library, Database, Table, ObjectSet, AstroDBError,
-    ADB_COMP_LT, ADB_COMP_GT, ADB_OP_AND, ADB_OP_OR
+    R2D, TWO_PI,
+    AdbOp, AdbComp
 )
 from astrodb.lib import (
     ADB_CTYPE_STRING, ADB_CTYPE_INT, ADB_CTYPE_DOUBLE_HMS_HRS,
     ADB_CTYPE_DOUBLE_HMS_MINS, ADB_CTYPE_DOUBLE_HMS_SECS,
     ADB_CTYPE_DOUBLE_DMS_DEGS, ADB_CTYPE_DOUBLE_DMS_MINS,
-    ADB_CTYPE_DOUBLE_DMS_SECS, ADB_CTYPE_SIGN, ADB_CTYPE_FLOAT
+    ADB_CTYPE_DOUBLE_DMS_SECS, ADB_CTYPE_SIGN, ADB_CTYPE_FLOAT,
+    ADB_IMPORT_INC, adb_object
 )
+from astrodb.schema import Field, build_schema
 
-D2R = 1.7453292519943295769e-2
-R2D = 5.7295779513082320877e1
+class ngc_object(ctypes.Structure):
+    _fields_ = [
+        ("object", adb_object),
+        ("type", ctypes.c_ubyte * 4),
+        ("desc", ctypes.c_char * 51), # description
+    ]
+
+ngc_fields = build_schema(ngc_object, [
+    Field("Name", "Name", "object.designation", ADB_CTYPE_STRING),
+    Field("Type", "Type", "type", ADB_CTYPE_STRING),
+    Field("RA Hours", "RAh", "object.ra", ADB_CTYPE_DOUBLE_HMS_HRS, "hours", 1, group=True),
+    Field("RA Minutes", "RAm", "object.ra", ADB_CTYPE_DOUBLE_HMS_MINS, "minutes", 0, group=True),
+    Field("DEC Degrees", "DEd", "object.dec", ADB_CTYPE_DOUBLE_DMS_DEGS, "degrees", 2, group=True),
+    Field("DEC Minutes", "DEm", "object.dec", ADB_CTYPE_DOUBLE_DMS_MINS, "minutes", 1, group=True),
+    Field("DEC sign", "DE-", "object.dec", ADB_CTYPE_SIGN, group=True),
+    Field("Integrated Mag", "mag", "object.mag", ADB_CTYPE_FLOAT),
+    Field("Description", "Desc", "desc", ADB_CTYPE_STRING),
+    Field("Largest Dimension", "size", "object.size", ADB_CTYPE_FLOAT, "arcmin"),
+])
 
 def print_objects(oset):
     for obj in oset:
@@ -23,7 +43,7 @@ def get_all(db, table_id, print_out=False):
     try:
         tbl = Table(db, "VII", "118", "ngc2000")
         oset = ObjectSet(tbl)
-        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, 0.0, 16.0)
+        oset.apply_constraints(0.0, 0.0, TWO_PI, 0.0, 16.0)
         oset.populate()
         
         print(f" found {len(oset)} object list heads {len(oset)} objects\n")
@@ -54,19 +74,8 @@ def ngc_import(lib_dir):
         lib = Library("cdsarc.u-strasbg.fr", "/pub/cats", lib_dir)
         db = Database(lib, 5, 1)
         
-        tbl = Table.import_new(db, "VII", "118", "ngc2000", "mag", 0.0, 18.0)
-        
-        # Add ngc schema layout equivalent
-        tbl.import_field("Name", "Name", ADB_CTYPE_STRING, "", 0)
-        tbl.import_field("Type", "Type", ADB_CTYPE_STRING, "", 0)
-        tbl.import_field("RA Hours", "RAh", ADB_CTYPE_DOUBLE_HMS_HRS, "hours", 1)
-        tbl.import_field("RA Minutes", "RAm", ADB_CTYPE_DOUBLE_HMS_MINS, "minutes", 0)
-        tbl.import_field("DEC Degrees", "DEd", ADB_CTYPE_DOUBLE_DMS_DEGS, "degrees", 2)
-        tbl.import_field("DEC Minutes", "DEm", ADB_CTYPE_DOUBLE_DMS_MINS, "minutes", 1)
-        tbl.import_field("DEC sign", "DE-", ADB_CTYPE_SIGN, "", 0)
-        tbl.import_field("Integrated Mag", "mag", ADB_CTYPE_FLOAT, "", 0)
-        tbl.import_field("Description", "Desc", ADB_CTYPE_STRING, "", 0)
-        tbl.import_field("Largest Dimension", "size", ADB_CTYPE_FLOAT, "arcmin", 0)
+        tbl = Table.import_new(db, "VII", "118", "ngc2000", "mag", 0.0, 18.0, ADB_IMPORT_INC)
+        tbl.import_schema(ngc_fields, ctypes.sizeof(ngc_object))
         
         tbl.run_import()
         tbl.close()
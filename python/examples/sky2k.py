@@ -1,9 +1,12 @@
 import sys
 import time
 import math
+import ctypes
+import functools
 from astrodb import (
     Library, Database, Table, ObjectSet, Search, Solver, Solution, AstroDBError,
-    ADB_COMP_LT, ADB_COMP_GT, ADB_OP_AND, ADB_OP_OR, ADB_COMP_EQ,
+    D2R, R2D, TWO_PI,
+    AdbOp, AdbComp, compile_terms,
     ADB_FIND_FIRST, ADB_CONSTRAINT_MAG, ADB_CONSTRAINT_FOV,
 )
 from astrodb.lib import (
@@ -11,11 +14,185 @@ from astrodb.lib import (
     ADB_CTYPE_DOUBLE_HMS_MINS, ADB_CTYPE_DOUBLE_HMS_SECS,
     ADB_CTYPE_DOUBLE_DMS_DEGS, ADB_CTYPE_DOUBLE_DMS_MINS,
     ADB_CTYPE_DOUBLE_DMS_SECS, ADB_CTYPE_SIGN, ADB_CTYPE_FLOAT,
-    ADB_CTYPE_DOUBLE, ADB_CTYPE_SHORT, adb_pobject,
+    ADB_CTYPE_DOUBLE, ADB_CTYPE_SHORT, ADB_IMPORT_INC, adb_pobject,
+    adb_object, adb_field_import1
 )
+from astrodb.schema import Field, build_schema
 
-D2R = 1.7453292519943295769e-2
-R2D = 5.7295779513082320877e1
+# Members are ordered by alignment, widest first, so the only padding is
+# at the tail. The default ctypes layout is the C one, no _pack_ needed.
+class sky2kv4_object(ctypes.Structure):
+    _fields_ = [
+        ("object", adb_object),
+        ("pmRA", ctypes.c_double),
+        ("pmDEC", ctypes.c_double),
+        ("RV", ctypes.c_double),
+        ("sep", ctypes.c_double), # separation between 1st and 2nd brightest
+        ("orbPer", ctypes.c_double),
+        ("date", ctypes.c_double),
+        ("varPer", ctypes.c_double),
+        ("varEpo", ctypes.c_double),
+        ("Dmag", ctypes.c_float),
+        ("magMax", ctypes.c_float),
+        ("magMin", ctypes.c_float),
+        ("varAmp", ctypes.c_float),
+        ("HD", ctypes.c_int),
+        ("SAO", ctypes.c_int),
+        ("PPM", ctypes.c_int),
+        ("ID_A", ctypes.c_int),
+        ("ID_B", ctypes.c_int),
+        ("ID_C", ctypes.c_int),
+        ("PA", ctypes.c_short),
+        ("varType", ctypes.c_short),
+        ("type", ctypes.c_ubyte),
+        ("name", ctypes.c_char * 11), # Name or AGK3 number
+        ("sp", ctypes.c_char * 4), # One dimensional SP class
+    ]
+
+# spectral classes in the order of the C example's star colour table
+SP_CLASSES = (
+    b"O5V", b"O6V", b"O7V", b"O8V", b"O9V", b"O9.5V", b"B0V", b"B0.5V",
+    b"B1V", b"B2V", b"B3V", b"B4V", b"B5V", b"B6V", b"B7V", b"B8V",
+    b"B9V", b"A0V", b"A1V", b"A2V", b"A5V", b"A6V", b"A7V", b"A8V",
+    b"A9V", b"F0V", b"F2V", b"F4V", b"F5V", b"F6V", b"F7V", b"F8V",
+    b"F9V", b"G0V", b"G1V", b"G2V", b"G4V", b"G5V", b"G6V", b"G7V",
+    b"G8V", b"G9V", b"K0V", b"K1V", b"K2V", b"K3V", b"K4V", b"K5V",
+    b"K7V", b"K8V", b"M0V", b"M1V", b"M2V", b"M3V", b"M4V", b"M5V",
+    b"M6V", b"M8V", b"B1IV", b"B2IV", b"B3IV", b"B6IV", b"B7IV", b"B9IV",
+    b"A0IV", b"A3IV", b"A4IV", b"A5IV", b"A7IV", b"A9IV", b"F0IV", b"F2IV",
+    b"F3IV", b"F5IV", b"F7IV", b"F8IV", b"G0IV", b"G2IV", b"G3IV", b"G4IV",
+    b"G5IV", b"G6IV", b"G7IV", b"G8IV", b"K0IV", b"K1IV", b"K2IV", b"K3IV",
+    b"O7III", b"O8III", b"O9III", b"B0III", b"B1III", b"B2III", b"B3III", b"B5III",
+    b"B7III", b"B9III", b"A0III", b"A3III", b"A5III", b"A6III", b"A7III", b"A8III",
+    b"A9III", b"F0III", b"F2III", b"F4III", b"F5III", b"F6III", b"F7III", b"G0III",
+    b"G1III", b"G2III", b"G3III", b"G4III", b"G5III", b"G6III", b"G8III", b"G9III",
+    b"K0III", b"K1III", b"K2III", b"K3III", b"K4III", b"K5III", b"K7III", b"M0III",
+    b"M1III", b"M2III", b"M3III", b"M4III", b"M5III", b"M6III", b"M7III", b"M8III",
+    b"M9III", b"B2II", b"B5II", b"F0II", b"F2II", b"G5II", b"M3II", b"O9I",
+    b"B0I", b"B1I", b"B2I", b"B3I", b"B4I", b"B5I", b"B6I", b"B7I",
+    b"B8I", b"B9I", b"A0I", b"A1I", b"A2I", b"A5I", b"F0I", b"F2I",
+    b"F5I", b"F8I", b"G0I", b"G2I", b"G3I", b"G5I", b"G8I", b"K0I",
+    b"K1I", b"K2I", b"K3I", b"K4I", b"K5I", b"M0I", b"M1I", b"M2I",
+    b"M3I", b"M4I", b"N", b"",
+)
+
+# every prefix of SP_CLASSES mapped to the first class it starts, so a
+# class is found with one lookup per prefix length instead of a scan
+_SP_MAXLEN = max(map(len, SP_CLASSES))
+_SP_PREFIXES = {}
+for _i, _sp in enumerate(SP_CLASSES):
+    for _m in range(1, len(_sp) + 1):
+        _SP_PREFIXES.setdefault(_sp[:_m], _i)
+
+@functools.lru_cache(maxsize=None)
+def sp_index(spect: bytes) -> int:
+    """Index of the closest SP_CLASSES entry, as sky2kv4_get_sp_index() in C."""
+    for m in range(min(len(spect), _SP_MAXLEN), 0, -1):
+        i = _SP_PREFIXES.get(spect[:m])
+        if i is not None:
+            return i
+    return len(SP_CLASSES)
+
+_TYPE = sky2kv4_object.type.offset
+
+@adb_field_import1
+def sky2kv4_sp_insert(obj_ptr, offset, src):
+    # the column is fixed width, whitespace is ASCII so strip the bytes as is
+    val = src.strip()
+    base = ctypes.addressof(obj_ptr.contents)
+    sp = val[:sky2kv4_object.sp.size - 1]
+    ctypes.memmove(base + offset, sp + b"\0", len(sp) + 1)
+    ctypes.c_ubyte.from_address(base + _TYPE).value = sp_index(val)
+    return 0
+
+# sky2kv4_sp_insert() runs once per imported row, when numba is available
+# replace it with a native cfunc so the C import loop never enters Python.
+try:
+    import numba
+    import numpy as np
+    from numba import types
+except ImportError:
+    numba = None
+
+if numba is not None:
+    # _SP_PREFIXES as sorted little endian integer keys the cfunc can
+    # binary search, class names hold no NUL so the keys are unique
+    _sp_keys = sorted((int.from_bytes(p, 'little'), i) for p, i in _SP_PREFIXES.items())
+    _SP_KEYS = np.array([k for k, _ in _sp_keys], dtype=np.int64)
+    _SP_VALS = np.array([i for _, i in _sp_keys], dtype=np.uint8)
+    _SP_COUNT = len(SP_CLASSES)
+    _SP_SIZE = sky2kv4_object.sp.size
+
+    _SPACE, _TAB, _CR = ord(" "), ord("\t"), ord("\r")
+
+    @numba.njit(cache=True)
+    def _is_space(c):
+        return c == _SPACE or _TAB <= c <= _CR
+
+    @numba.njit(cache=True)
+    def _sp_index(src, start, slen):
+        for m in range(min(slen, _SP_MAXLEN), 0, -1):
+            key = 0
+            for k in range(m - 1, -1, -1):
+                key = (key << 8) | src[start + k]
+            pos = np.searchsorted(_SP_KEYS, key)
+            if pos < _SP_KEYS.shape[0] and _SP_KEYS[pos] == key:
+                return _SP_VALS[pos]
+        return _SP_COUNT
+
+    @numba.cfunc(types.int32(types.CPointer(types.uint8), types.int32, types.CPointer(types.uint8)), cache=True)
+    def _sky2kv4_sp_insert_native(obj, offset, src):
+        start = 0
+        while src[start] != 0 and _is_space(src[start]):
+            start += 1
+        end = start
+        while src[end] != 0:
+            end += 1
+        while end > start and _is_space(src[end - 1]):
+            end -= 1
+        slen = end - start
+        n = min(slen, _SP_SIZE - 1)
+        for k in range(n):
+            obj[offset + k] = src[start + k]
+        obj[offset + n] = 0
+        obj[_TYPE] = _sp_index(src, start, slen)
+        return 0
+
+    sky2kv4_sp_insert = adb_field_import1(_sky2kv4_sp_insert_native.address)
+
+sky2kv4_fields = build_schema(sky2kv4_object, [
+    Field("Name", "Name", "name", ADB_CTYPE_STRING),
+    Field("ID", "ID", "object.id", ADB_CTYPE_INT),
+    Field("RA Hours", "RAh", "object.ra", ADB_CTYPE_DOUBLE_HMS_HRS, "hours", 2, group=True),
+    Field("RA Minutes", "RAm", "object.ra", ADB_CTYPE_DOUBLE_HMS_MINS, "minutes", 1, group=True),
+    Field("RA Seconds", "RAs", "object.ra", ADB_CTYPE_DOUBLE_HMS_SECS, "seconds", 0, group=True),
+    Field("DEC Degrees", "DEd", "object.dec", ADB_CTYPE_DOUBLE_DMS_DEGS, "degrees", 3, group=True),
+    Field("DEC Minutes", "DEm", "object.dec", ADB_CTYPE_DOUBLE_DMS_MINS, "minutes", 2, group=True),
+    Field("DEC Seconds", "DEs", "object.dec", ADB_CTYPE_DOUBLE_DMS_SECS, "seconds", 1, group=True),
+    Field("DEC sign", "DE-", "object.dec", ADB_CTYPE_SIGN, group=True),
+    Field("Visual Mag", "Vmag", "object.mag", ADB_CTYPE_FLOAT),
+    Field("sp", "Sp", "sp", ADB_CTYPE_STRING, import_cb=sky2kv4_sp_insert),
+    Field("HD", "HD", "HD", ADB_CTYPE_INT),
+    Field("SAO", "SAO", "SAO", ADB_CTYPE_INT),
+    Field("PPM", "PPM", "PPM", ADB_CTYPE_INT),
+    Field("pmRA", "pmRA", "pmRA", ADB_CTYPE_DOUBLE),
+    Field("pmDEC", "pmDEC", "pmDEC", ADB_CTYPE_DOUBLE),
+    Field("Radial Vel", "RV", "RV", ADB_CTYPE_DOUBLE),
+    Field("Binary sep", "sep", "sep", ADB_CTYPE_DOUBLE),
+    Field("Dmag", "Dmag", "Dmag", ADB_CTYPE_FLOAT),
+    Field("Orb Per", "orbPer", "orbPer", ADB_CTYPE_DOUBLE),
+    Field("Pos Angle", "PA", "PA", ADB_CTYPE_SHORT),
+    Field("Obs Date", "date", "date", ADB_CTYPE_DOUBLE),
+    Field("ID_A", "ID_A", "ID_A", ADB_CTYPE_INT),
+    Field("ID_B", "ID_B", "ID_B", ADB_CTYPE_INT),
+    Field("ID_C", "ID_C", "ID_C", ADB_CTYPE_INT),
+    Field("Var max mag", "magMax", "magMax", ADB_CTYPE_FLOAT),
+    Field("Var min mag", "magMin", "magMin", ADB_CTYPE_FLOAT),
+    Field("Var Amp", "varAmp", "varAmp", ADB_CTYPE_FLOAT),
+    Field("Var Period", "varPer", "varPer", ADB_CTYPE_DOUBLE),
+    Field("Var Epoch", "varEpo", "varEpo", ADB_CTYPE_DOUBLE),
+    Field("Var Type", "varType", "varType", ADB_CTYPE_SHORT),
+])
 
 def print_objects(oset):
     for obj in oset:
@@ -38,7 +215,7 @@ def sobject_printf(sobject):
 def get1(db, tbl, print_out=False):
     print("Get all objects")
     oset = ObjectSet(tbl)
-    oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, -2.0, 16.0)
+    oset.apply_constraints(0.0, 0.0, TWO_PI, -2.0, 16.0)
     oset.populate()
     print(f" found {len(oset)} object list heads {len(oset)} objects\n")
     if print_out: print_objects(oset)
@@ -47,7 +224,7 @@ def get1(db, tbl, print_out=False):
 def get2(db, tbl, print_out=False):
     print("Get all objects < mag 2")
     oset = ObjectSet(tbl)
-    oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, -2.0, 2.0)
+    oset.apply_constraints(0.0, 0.0, TWO_PI, -2.0, 2.0)
     oset.populate()
     print(f" found {len(oset)} object list heads {len(oset)} objects\n")
     if print_out: print_objects(oset)
@@ -89,23 +266,27 @@ def get4(db, tbl, print_out=False):
     
     oset.close()
 
+# search1() expression, constant so it is compiled once at import
+HIGH_PM_RV_TERMS = compile_terms([
+    ("pmRA", AdbComp.LT, "0.4"),
+    ("pmRA", AdbComp.GT, "0.01"),
+    AdbOp.AND,
+    ("pmDEC", AdbComp.LT, "0.4"),
+    ("pmDEC", AdbComp.GT, "0.01"),
+    AdbOp.AND,
+    ("RV", AdbComp.LT, "40"),
+    ("RV", AdbComp.GT, "25"),
+    AdbOp.AND,
+    AdbOp.AND,
+])
+
 def search1(db, tbl, print_out=False):
     print("Searching for high PM or RV objects")
     search = Search(tbl)
     oset = ObjectSet(tbl)
     
-    search.add_comparator("pmRA", ADB_COMP_LT, "0.4")
-    search.add_comparator("pmRA", ADB_COMP_GT, "0.01")
-    search.add_operator(ADB_OP_AND)
-    
-    search.add_comparator("pmDEC", ADB_COMP_LT, "0.4")
-    search.add_comparator("pmDEC", ADB_COMP_GT, "0.01")
-    search.add_operator(ADB_OP_AND)
-    
-    search.add_comparator("RV", ADB_COMP_LT, "40")
-    search.add_comparator("RV", ADB_COMP_GT, "25")
-    search.add_operator(ADB_OP_AND)
-    search.add_operator(ADB_OP_AND)
+    # whole RPN expression in one call
+    search.add_terms(HIGH_PM_RV_TERMS)
     
     start_t = time.time()
     search.execute(oset)
@@ -130,8 +311,8 @@ def search2(db, tbl, print_out=False):
     search = Search(tbl)
     oset = ObjectSet(tbl)
     
-    search.add_comparator("Sp", ADB_COMP_EQ, "G5*")
-    search.add_operator(ADB_OP_OR)
+    search.add_comparator("Sp", AdbComp.EQ, "G5*")
+    search.add_operator(AdbOp.OR)
     
     start_t = time.time()
     search.execute(oset)
@@ -154,8 +335,8 @@ def search3(db, tbl, print_out=False):
     search = Search(tbl)
     oset = ObjectSet(tbl)
     
-    search.add_comparator("Sp", ADB_COMP_EQ, "M1")
-    search.add_operator(ADB_OP_OR)
+    search.add_comparator("Sp", AdbComp.EQ, "M1")
+    search.add_operator(AdbOp.OR)
     
     start_t = time.time()
     search.execute(oset)
@@ -262,43 +443,14 @@ def sky2k_import(lib_dir, mag_limit):
         lib = Library("cdsarc.u-strasbg.fr", "/pub/cats", lib_dir)
         db = Database(lib, 7, 1)
         
-        tbl = Table.import_new(db, "V", "109", "sky2kv4", "Vmag", -2.0, mag_limit)
-        
-        # Add sky2k schema layout equivalent
-        tbl.import_field("Name", "Name", ADB_CTYPE_STRING, "", 0)
-        tbl.import_field("ID", "ID", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("RA Hours", "RAh", ADB_CTYPE_DOUBLE_HMS_HRS, "hours", 2)
-        tbl.import_field("RA Minutes", "RAm", ADB_CTYPE_DOUBLE_HMS_MINS, "minutes", 1)
-        tbl.import_field("RA Seconds", "RAs", ADB_CTYPE_DOUBLE_HMS_SECS, "seconds", 0)
-        tbl.import_field("DEC Degrees", "DEd", ADB_CTYPE_DOUBLE_DMS_DEGS, "degrees", 3)
-        tbl.import_field("DEC Minutes", "DEm", ADB_CTYPE_DOUBLE_DMS_MINS, "minutes", 2)
-        tbl.import_field("DEC Seconds", "DEs", ADB_CTYPE_DOUBLE_DMS_SECS, "seconds", 1)
-        tbl.import_field("DEC sign", "DE-", ADB_CTYPE_SIGN, "", 0)
-        tbl.import_field("Visual Mag", "Vmag", ADB_CTYPE_FLOAT, "", 0)
-        tbl.import_field("sp", "Sp", ADB_CTYPE_STRING, "", 0)
-        tbl.import_field("HD", "HD", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("SAO", "SAO", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("PPM", "PPM", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("pmRA", "pmRA", ADB_CTYPE_DOUBLE, "", 0)
-        tbl.import_field("pmDEC", "pmDEC", ADB_CTYPE_DOUBLE, "", 0)
-        tbl.import_field("Radial Vel", "RV", ADB_CTYPE_DOUBLE, "", 0)
-        tbl.import_field("Binary sep", "sep", ADB_CTYPE_DOUBLE, "", 0)
-        tbl.import_field("Dmag", "Dmag", ADB_CTYPE_FLOAT, "", 0)
-        tbl.import_field("Orb Per", "orbPer", ADB_CTYPE_DOUBLE, "", 0)
-        tbl.import_field("Pos Angle", "PA", ADB_CTYPE_SHORT, "", 0)
-        tbl.import_field("Obs Date", "date", ADB_CTYPE_DOUBLE, "", 0)
-        tbl.import_field("ID_A", "ID_A", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("ID_B", "ID_B", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("ID_C", "ID_C", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("Var max mag", "magMax", ADB_CTYPE_FLOAT, "", 0)
-        tbl.import_field("Var min mag", "magMin", ADB_CTYPE_FLOAT, "", 0)
-        tbl.import_field("Var Amp", "varAmp", ADB_CTYPE_FLOAT, "", 0)
-        tbl.import_field("Var Period", "varPer", ADB_CTYPE_DOUBLE, "", 0)
-        tbl.import_field("Var Epoch", "varEpo", ADB_CTYPE_DOUBLE, "", 0)
-        tbl.import_field("Var Type", "varType", ADB_CTYPE_SHORT, "", 0)
-        
-        tbl.import_field("Vmag", "Vder", 0, "", 0)
+        tbl = Table.import_new(db, "V", "109", "sky2kv4", "Vmag", -2.0, mag_limit, ADB_IMPORT_INC)
         
+        tbl.import_schema(sky2kv4_fields, ctypes.sizeof(sky2kv4_object))
+
+        # Vmag is blank in some records in the dataset, so we can use Vder
+        # as an alternate field.
+        tbl.import_field("Vmag", "Vder", 0)
+
         tbl.run_import()
         tbl.close()
         
@@ -1,16 +1,149 @@
 import sys
-import math
+import re
 import ctypes
 from astrodb import (
-    Library, Database, Table, ObjectSet, AstroDBError,
+    Library, Database, Table, ObjectSet, Search, AstroDBError,
+    D2R, R2D, TWO_PI,
 )
 from astrodb.lib import (
-    ADB_CTYPE_STRING, ADB_CTYPE_INT, ADB_CTYPE_FLOAT,
-    ADB_CTYPE_DEGREES
+    ADB_CTYPE_INT, ADB_CTYPE_FLOAT, ADB_CTYPE_DEGREES,
+    ADB_IMPORT_DEC, adb_object, adb_field_import1
 )
+from astrodb.schema import Field, build_schema
 
-D2R = 1.7453292519943295769e-2
-R2D = 5.7295779513082320877e1
+class tycho_object(ctypes.Structure):
+    _fields_ = [
+        ("object", adb_object),
+        ("pmRA", ctypes.c_float),
+        ("pmDEC", ctypes.c_float),
+        ("plx", ctypes.c_float),
+        ("HD", ctypes.c_uint),
+        ("HIP", ctypes.c_uint),
+    ]
+
+_DESIGNATION_SIZE = adb_object.designation.size
+_ATOI = re.compile(rb"\s*[+-]?\d+")
+
+def _atoi(src: bytes) -> int:
+    m = _ATOI.match(src)
+    return int(m.group()) if m else 0
+
+# The TYC identifier is imported as three columns, the first starts the
+# designation and the other two append "-<n>" to it.
+@adb_field_import1
+def tycid1_sp_insert(obj_ptr, offset, src):
+    dest = ctypes.addressof(obj_ptr.contents) + offset
+    tmp = b"%d\0" % _atoi(src)
+    ctypes.memmove(dest, tmp, len(tmp))
+    return 0
+
+# designation length straight from the C buffer, no bytes object per row
+_strlen = ctypes.CDLL(None).strlen
+_strlen.argtypes = [ctypes.c_void_p]
+_strlen.restype = ctypes.c_size_t
+
+@adb_field_import1
+def tycid2_sp_insert(obj_ptr, offset, src):
+    dest = ctypes.addressof(obj_ptr.contents) + offset
+    n = _strlen(dest)
+    tmp = b"-%d\0" % _atoi(src)
+    if n + len(tmp) > _DESIGNATION_SIZE:
+        name = ctypes.string_at(dest, n) + tmp[:-1]
+        print(f"object designation \"{name.decode()}\" is too long", file=sys.stderr)
+        return -22 # -EINVAL
+    ctypes.memmove(dest + n, tmp, len(tmp))
+    return 0
+
+# The callbacks above run for each of the ~2.5M catalogue rows. When numba
+# is available replace them with native cfuncs that parse and format the
+# ids in place over the char pointers.
+try:
+    import numba
+    from numba import types
+except ImportError:
+    numba = None
+
+if numba is not None:
+    _SPACE, _PLUS, _MINUS, _ZERO, _NINE = (ord(c) for c in " +-09")
+    _TAB, _CR = ord("\t"), ord("\r")
+
+    @numba.njit(cache=True)
+    def _atoi_native(src):
+        i = 0
+        while src[i] == _SPACE or _TAB <= src[i] <= _CR:
+            i += 1
+        neg = src[i] == _MINUS
+        if neg or src[i] == _PLUS:
+            i += 1
+        val = 0
+        while _ZERO <= src[i] <= _NINE:
+            val = val * 10 + (src[i] - _ZERO)
+            i += 1
+        return -val if neg else val
+
+    @numba.njit(cache=True)
+    def _itoa_len(val):
+        n = 1 if val <= 0 else 0
+        val = abs(val)
+        while val != 0:
+            val //= 10
+            n += 1
+        return n
+
+    @numba.njit(cache=True)
+    def _itoa(dest, pos, val, n):
+        # write the n characters of val at dest[pos] followed by a NUL
+        if val < 0:
+            dest[pos] = _MINUS
+            val = -val
+        end = pos + n
+        dest[end] = 0
+        end -= 1
+        while True:
+            dest[end] = _ZERO + val % 10
+            val //= 10
+            end -= 1
+            if val == 0:
+                break
+
+    _char_sig = types.int32(types.CPointer(types.uint8), types.int32, types.CPointer(types.uint8))
+
+    @numba.cfunc(_char_sig, cache=True)
+    def _tycid1_sp_insert_native(obj, offset, src):
+        val = _atoi_native(src)
+        _itoa(obj, offset, val, _itoa_len(val))
+        return 0
+
+    @numba.cfunc(_char_sig, cache=True)
+    def _tycid2_sp_insert_native(obj, offset, src):
+        # append "-<id>" to the designation at offset
+        pos = 0
+        while pos < _DESIGNATION_SIZE and obj[offset + pos] != 0:
+            pos += 1
+        val = _atoi_native(src)
+        n = _itoa_len(val)
+        if pos + 1 + n >= _DESIGNATION_SIZE:
+            return -22 # -EINVAL
+        obj[offset + pos] = _MINUS
+        _itoa(obj, offset + pos + 1, val, n)
+        return 0
+
+    tycid1_sp_insert = adb_field_import1(_tycid1_sp_insert_native.address)
+    tycid2_sp_insert = adb_field_import1(_tycid2_sp_insert_native.address)
+
+tycho_fields = build_schema(tycho_object, [
+    Field("Name", "TYCID1", "object.designation", ADB_CTYPE_INT, import_cb=tycid1_sp_insert),
+    Field("Name", "TYCID2", "object.designation", ADB_CTYPE_INT, import_cb=tycid2_sp_insert),
+    Field("Name", "TYCID3", "object.designation", ADB_CTYPE_INT, import_cb=tycid2_sp_insert),
+    Field("RA", "RAdeg", "object.ra", ADB_CTYPE_DEGREES, "degrees"),
+    Field("DEC", "DEdeg", "object.dec", ADB_CTYPE_DEGREES, "degrees"),
+    Field("Mag", "VT", "object.mag", ADB_CTYPE_FLOAT),
+    Field("pmRA", "pmRA", "pmRA", ADB_CTYPE_FLOAT, "mas/a"),
+    Field("pmDEC", "pmDEC", "pmDEC", ADB_CTYPE_FLOAT, "mas/a"),
+    Field("Parallax", "Plx", "plx", ADB_CTYPE_FLOAT, "mas"),
+    Field("HD Number", "HD", "HD", ADB_CTYPE_INT),
+    Field("HIP Number", "HIP", "HIP", ADB_CTYPE_INT),
+])
 
 def print_objects(oset):
     for obj in oset:
@@ -19,7 +152,7 @@ def print_objects(oset):
 def get_all(db, tbl, print_out=False):
     print("Get all objects")
     oset = ObjectSet(tbl)
-    oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, 0.0, 16.0)
+    oset.apply_constraints(0.0, 0.0, TWO_PI, 0.0, 16.0)
     oset.populate()
     
     print(f" found {len(oset)} object list heads {len(oset)} objects\n")
@@ -38,16 +171,26 @@ def get_all(db, tbl, print_out=False):
             
     oset.close()
 
+# get2() field centre and radius in radians
+_GET2_RA, _GET2_DEC, _GET2_FOV = 341.0 * D2R, 58.0 * D2R, 1.0 * D2R
+
 def get2(db, tbl, print_out=False):
     print("Get all objects around 1 deg FoV RA 341.0, DEC 58.0")
     oset = ObjectSet(tbl)
-    oset.apply_constraints(341.0 * D2R, 58.0 * D2R, 1.0 * D2R, -2.0, 16.0)
+    oset.apply_constraints(_GET2_RA, _GET2_DEC, _GET2_FOV, -2.0, 16.0)
     oset.populate()
     
     print(f" found {len(oset)} object list heads {len(oset)} objects\n")
     if print_out:
         print_objects(oset)
-        
+
+    # the trixels cover more sky than the FoV, keep only the objects inside it
+    search = Search(tbl)
+    search.add_cone(_GET2_RA, _GET2_DEC, _GET2_FOV)
+    hits = search.execute(oset)
+    print(f" {hits} objects within 1 deg\n")
+
+    search.close()
     oset.close()
 
 def tycho_query(lib_dir, print_out=False):
@@ -73,22 +216,9 @@ def tycho_import(lib_dir):
         lib = Library("cdsarc.u-strasbg.fr", "/pub/cats", lib_dir)
         db = Database(lib, 7, 1)
         
-        # ADB_IMPORT_DEC = 1
-        tbl = Table.import_new(db, "I", "250", "catalog", "VT", 0.0, 16.0, 1)
-        
-        # Add schema equivalent
-        tbl.import_field("Name", "TYCID1", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("Name", "TYCID2", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("Name", "TYCID3", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("RA", "RAdeg", ADB_CTYPE_DEGREES, "degrees", 0)
-        tbl.import_field("DEC", "DEdeg", ADB_CTYPE_DEGREES, "degrees", 0)
-        tbl.import_field("Mag", "VT", ADB_CTYPE_FLOAT, "", 0)
-        tbl.import_field("pmRA", "pmRA", ADB_CTYPE_FLOAT, "mas/a", 0)
-        tbl.import_field("pmDEC", "pmDEC", ADB_CTYPE_FLOAT, "mas/a", 0)
-        tbl.import_field("Parallax", "Plx", ADB_CTYPE_FLOAT, "mas", 0)
-        tbl.import_field("HD Number", "HD", ADB_CTYPE_INT, "", 0)
-        tbl.import_field("HIP Number", "HIP", ADB_CTYPE_INT, "", 0)
-        
+        tbl = Table.import_new(db, "I", "250", "catalog", "VT", 0.0, 16.0, ADB_IMPORT_DEC)
+        tbl.import_schema(tycho_fields, ctypes.sizeof(tycho_object))
+
         tbl.run_import()
         tbl.close()
         db.close()
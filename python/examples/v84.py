@@ -11,9 +11,6 @@ from astrodb.lib import (
     ADB_CTYPE_SIGN, adb_object_p, adb_object
 )
 
-D2R = 1.7453292519943295769e-2
-R2D = 5.7295779513082320877e1
-
 def v84_merge(lib_dir):
     try:
         lib = Library("cdsarc.u-strasbg.fr", "/pub/cats", lib_dir)
@@ -17,5 +17,6 @@ setup(
     ],
     python_requires=">=3.6",
     install_requires=[],
+    extras_require={"numpy": ["numpy"]},
     zip_safe=False,
 )
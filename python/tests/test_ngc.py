@@ -5,6 +5,13 @@ import ctypes
 from astrodb import Library, Database, Table, ObjectSet, AstroDBError
 from astrodb.lib import adb_object
 
+class ngc_object(ctypes.Structure):
+    _fields_ = [
+        ("object", adb_object),
+        ("type", ctypes.c_ubyte * 4),
+        ("desc", ctypes.c_char * 51),
+    ]
+
 class TestNGC(unittest.TestCase):
     def setUp(self):
         self.local_dir = os.path.join(os.path.dirname(__file__), '..', '..', 'tests')
@@ -65,6 +72,195 @@ class TestNGC(unittest.TestCase):
         oset.close()
         tbl.close()
 
+    def test_filter_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy not installed")
+        tbl = self._get_table_safely()
+        oset = ObjectSet(tbl)
+        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, 0.0, 16.0)
+        oset.populate()
+
+        arr = oset.to_numpy()
+        self.assertEqual(len(arr), len(oset))
+
+        hits = oset.filter_numpy(ra_between=(2.7, 3.0), dec_between=(0.0, 0.34))
+        self.assertTrue(len(hits) < len(arr))
+        self.assertTrue(((hits['ra'] > 2.7) & (hits['ra'] < 3.0)).all())
+        self.assertTrue(((hits['dec'] > 0.0) & (hits['dec'] < 0.34)).all())
+
+        oset.close()
+        tbl.close()
+
+    def test_to_numpy_catalogue(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy not installed")
+        tbl = self._get_table_safely()
+        oset = ObjectSet(tbl)
+        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, 0.0, 16.0)
+        oset.populate()
+
+        arr = oset.to_numpy(ngc_object)
+        base = oset.to_numpy()
+        numpy.testing.assert_array_equal(arr['ra'], base['ra'])
+        numpy.testing.assert_array_equal(arr['mag'], base['mag'])
+        self.assertIn('desc', arr.dtype.names)
+
+        # views alias the same rows without a copy
+        views = oset.numpy_views(ngc_object)
+        numpy.testing.assert_array_equal(numpy.concatenate([v['dec'] for v in views]), arr['dec'])
+
+        oset.close()
+        tbl.close()
+
+    def test_table_views(self):
+        tbl = self._get_table_safely()
+        view = tbl.objects_view()
+        self.assertEqual(len(view), len(tbl))
+        self.assertEqual(view.shape[1], tbl.object_size)
+
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy not installed")
+        arr = tbl.numpy_view(ngc_object)
+        self.assertEqual(len(arr), len(tbl))
+
+        # an all sky set holds every table object
+        oset = ObjectSet(tbl)
+        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, 0.0, 16.0)
+        oset.populate()
+        numpy.testing.assert_array_equal(numpy.sort(arr['ra']), numpy.sort(oset.to_numpy()['ra']))
+
+        oset.close()
+        tbl.close()
+
+    def test_as_struct(self):
+        tbl = self._get_table_safely()
+        oset = ObjectSet(tbl)
+        oset.apply_constraints(2.87, 0.17, 0.17, 0.0, 16.0)
+        oset.populate()
+
+        offset = tbl.get_field_offset("Desc")
+        self.assertEqual(offset, ngc_object.desc.offset)
+        self.assertEqual(tbl.get_field_offset("Desc"), offset)
+
+        for obj in list(oset)[:50]:
+            ngc = obj.as_struct(ngc_object)
+            self.assertEqual(ngc.object.ra, obj.ra)
+            self.assertEqual(ngc.desc.decode('utf-8', 'ignore'), obj.get_string("Desc"))
+
+        oset.close()
+        tbl.close()
+
+    def test_count_fields(self):
+        tbl = self._get_table_safely()
+        oset = ObjectSet(tbl)
+        ra = [2.87, 0.0, 4.5]
+        dec = [0.17, 1.57, -0.6]
+
+        expected = []
+        for r, d in zip(ra, dec):
+            oset.apply_constraints(r, d, 0.17, 0.0, 16.0)
+            oset.populate()
+            expected.append(len(oset))
+
+        self.assertEqual(oset.count_fields(ra, dec, 0.17, 0.0, 16.0), expected)
+        # left populated for the last field
+        self.assertEqual(len(oset), expected[-1])
+
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy not installed")
+        # NumPy scalar and 0-d fov apply to every field like a float
+        ra_arr, dec_arr = numpy.array(ra), numpy.array(dec)
+        self.assertEqual(oset.count_fields(ra_arr, dec_arr, numpy.array(0.17), 0.0, 16.0), expected)
+        fov32 = numpy.float32(0.17)
+        self.assertEqual(oset.count_fields(ra_arr, dec_arr, fov32, 0.0, 16.0),
+                         oset.count_fields(ra, dec, float(fov32), 0.0, 16.0))
+
+        oset.close()
+        tbl.close()
+
+    def test_great_circle(self):
+        try:
+            from astrodb.simd import great_circle
+        except ImportError:
+            self.skipTest("numpy not installed")
+        tbl = self._get_table_safely()
+        oset = ObjectSet(tbl)
+        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, 0.0, 16.0)
+        oset.populate()
+
+        arr = oset.to_numpy()
+        dist = great_circle(arr['ra'], arr['dec'], 2.8, 0.2)
+        self.assertEqual(len(dist), len(arr))
+
+        # compare against the spherical law of cosines per object
+        for d, ra, dec in list(zip(dist, arr['ra'], arr['dec']))[:100]:
+            c = math.sin(dec) * math.sin(0.2) + math.cos(dec) * math.cos(0.2) * math.cos(ra - 2.8)
+            self.assertAlmostEqual(d, math.acos(max(-1.0, min(1.0, c))), places=6)
+
+        oset.close()
+        tbl.close()
+
+    def test_within_radius(self):
+        try:
+            from astrodb.simd import great_circle, within_radius
+        except ImportError:
+            self.skipTest("numpy not installed")
+        tbl = self._get_table_safely()
+        oset = ObjectSet(tbl)
+        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, 0.0, 16.0)
+        oset.populate()
+
+        arr = oset.to_numpy()
+        mask = within_radius(arr['ra'], arr['dec'], 2.87, 0.17, 0.17, use_cuda=False)
+        expected = great_circle(arr['ra'], arr['dec'], 2.87, 0.17) < 0.17
+        self.assertEqual(mask.tolist(), expected.tolist())
+
+        hits = oset.filter_numpy(near=(2.87, 0.17, 0.17))
+        self.assertEqual(len(hits), int(expected.sum()))
+
+        oset.close()
+        tbl.close()
+
+    def test_within_radius_invalid(self):
+        try:
+            from astrodb.simd import within_radius
+        except ImportError:
+            self.skipTest("numpy not installed")
+        with self.assertRaises(ValueError):
+            within_radius([0.0, 0.05], [0.0, 0.0], 0.0, 0.0, -0.1, use_cuda=False)
+        with self.assertRaises(ValueError):
+            within_radius([0.0, 0.05], [0.0, 0.0], 0.0, 0.0, float('nan'), use_cuda=False)
+        self.assertEqual(within_radius([0.0, 0.05], [0.0, 0.0], 0.0, 0.0, 0.0, use_cuda=False).tolist(),
+                         [False, False])
+
+    def test_trixels(self):
+        tbl = self._get_table_safely()
+        oset = ObjectSet(tbl)
+
+        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, 0.0, 16.0)
+        oset.populate()
+        all_sky = oset.trixels()
+
+        # all sky starts from both hemispheres at depth 0
+        self.assertEqual(sum(1 for t in all_sky if t[2] == 0), 8)
+
+        # a small FoV only covers part of the sphere
+        oset.apply_constraints(2.87, 0.17, 0.17, 0.0, 16.0)
+        oset.populate()
+        trixels = oset.trixels()
+        self.assertTrue(0 < len(trixels) < len(all_sky))
+
+        oset.close()
+        tbl.close()
+
     def test_query_faint_objects(self):
         tbl = self._get_table_safely()
         oset = ObjectSet(tbl)
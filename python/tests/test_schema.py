@@ -0,0 +1,79 @@
+import unittest
+import ctypes
+from astrodb.lib import adb_object, adb_schema_field, adb_set_member, adb_set_gmember
+from astrodb.lib import ADB_CTYPE_STRING, ADB_CTYPE_DOUBLE_HMS_HRS, ADB_CTYPE_FLOAT
+from astrodb.schema import Field, build_schema
+
+class test_object(ctypes.Structure):
+    _fields_ = [
+        ("object", adb_object),
+        ("pa", ctypes.c_float),
+    ]
+
+class TestSchema(unittest.TestCase):
+    def test_build_schema(self):
+        schema = build_schema(test_object, [
+            Field("Name", "Name", "object.designation", ADB_CTYPE_STRING),
+            Field("RA Hours", "RAh", "object.ra", ADB_CTYPE_DOUBLE_HMS_HRS, "hours", 1, group=True),
+            Field("Position Angle", "PA", "pa", ADB_CTYPE_FLOAT, "deg"),
+        ])
+        self.assertEqual(len(schema), 3)
+
+        self.assertEqual(schema[0].name, b"Name")
+        self.assertEqual(schema[0].struct_offset, adb_object.designation.offset)
+        self.assertEqual(schema[0].struct_bytes, 16)
+
+        # embedded members resolve relative to the outer object
+        self.assertEqual(schema[1].struct_offset, adb_object.ra.offset)
+        self.assertEqual(schema[1].group_offset, adb_object.ra.offset)
+        self.assertEqual(schema[1].group_posn, 1)
+        self.assertEqual(schema[1].units, b"hours")
+
+        self.assertEqual(schema[2].struct_offset, test_object.pa.offset)
+        self.assertEqual(schema[2].struct_bytes, 4)
+        self.assertEqual(schema[2].group_offset, 0)
+
+    def test_build_schema_layout(self):
+        schema = build_schema(test_object, [
+            Field("Name", "Name", "object.designation", ADB_CTYPE_STRING),
+            Field("RA Hours", "RAh", "object.ra", ADB_CTYPE_DOUBLE_HMS_HRS, "hours", 1, group=True),
+        ])
+
+        # the packed image matches filling each member through ctypes
+        expected = (adb_schema_field * 2)()
+        adb_set_member(expected, 0, b"Name", b"Name", adb_object.designation.offset, 16,
+                       ADB_CTYPE_STRING, b"", 0)
+        adb_set_gmember(expected, 1, b"RA Hours", b"RAh", adb_object.ra.offset, 8,
+                        ADB_CTYPE_DOUBLE_HMS_HRS, b"hours", 1)
+        self.assertEqual(bytes(schema), bytes(expected))
+
+    def test_field_strings(self):
+        a = Field("RA", "RAdeg", "object.ra", ADB_CTYPE_FLOAT, "degrees")
+        b = Field(b"DEC", b"DEdeg", "object.dec", ADB_CTYPE_FLOAT, b"degrees")
+        self.assertEqual((a.name, a.symbol, a.units), (b"RA", b"RAdeg", b"degrees"))
+        self.assertEqual(b.name, b"DEC")
+        self.assertIs(a.units, Field("x", "x", "pa", ADB_CTYPE_FLOAT, "degrees").units)
+
+    def test_field_too_long(self):
+        # symbol is char[8], it must keep its NUL terminator
+        with self.assertRaises(ValueError):
+            Field("Name", "SYMBOLTOOLONG123", "pa", ADB_CTYPE_FLOAT)
+        with self.assertRaises(ValueError):
+            Field("Name", "PA", "pa", ADB_CTYPE_FLOAT, "12345678")
+        Field("Name", "1234567", "pa", ADB_CTYPE_FLOAT, "1234567")
+
+    def test_build_schema_cached(self):
+        fields = [
+            Field("Name", "Name", "object.designation", ADB_CTYPE_STRING),
+            Field("Position Angle", "PA", "pa", ADB_CTYPE_FLOAT, "deg"),
+        ]
+        first = build_schema(test_object, fields)
+        second = build_schema(test_object, list(fields))
+
+        # same contents in a separate array the caller can modify
+        self.assertEqual(bytes(first), bytes(second))
+        second[0].name = b"Other"
+        self.assertEqual(first[0].name, b"Name")
+
+if __name__ == '__main__':
+    unittest.main()
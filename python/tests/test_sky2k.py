@@ -58,6 +58,22 @@ class TestSky2k(unittest.TestCase):
         oset.close()
         tbl.close()
 
+    def test_context_manager(self):
+        tbl = self._get_table_safely()
+        with tbl, ObjectSet(tbl) as oset, Search(tbl) as search:
+            oset.populate()
+            search.add_comparator("Sp", 2, "G5*") # EQ
+            search.add_operator(1) # OR
+            search.execute(oset)
+
+        self.assertIsNone(oset._ptr)
+        self.assertIsNone(search._ptr)
+        self.assertEqual(tbl.table_id, -1)
+
+        # closing again is harmless
+        oset.close()
+        tbl.close()
+
     def test_search1(self):
         tbl = self._get_table_safely()
         search = Search(tbl)
@@ -85,6 +101,160 @@ class TestSky2k(unittest.TestCase):
         oset.close()
         tbl.close()
 
+    def test_search_terms(self):
+        from astrodb import AdbOp, AdbComp, compile_terms
+        tbl = self._get_table_safely()
+        oset = ObjectSet(tbl)
+
+        search = Search(tbl)
+        search.add_comparator("RV", AdbComp.LT, "40")
+        search.add_comparator("RV", AdbComp.GT, "25")
+        search.add_operator(AdbOp.AND)
+        hits = search.execute(oset)
+        search.close()
+
+        # the same expression pushed in one call
+        search = Search(tbl)
+        search.add_terms([("RV", AdbComp.LT, "40"), ("RV", AdbComp.GT, "25"), AdbOp.AND])
+        self.assertEqual(search.execute(oset), hits)
+
+        with self.assertRaises(AstroDBError):
+            search.add_terms([AdbComp.LT])
+        search.close()
+
+        # a compiled expression can be reused across searches
+        terms = compile_terms([("RV", AdbComp.LT, "40"), ("RV", AdbComp.GT, "25"), AdbOp.AND])
+        for _ in range(2):
+            search = Search(tbl)
+            search.add_terms(terms)
+            self.assertEqual(search.execute(oset), hits)
+            search.close()
+
+        oset.close()
+        tbl.close()
+
+    def test_search_count(self):
+        tbl = self._get_table_safely()
+        oset = ObjectSet(tbl)
+        oset.apply_constraints(0.0, 0.0, 2.0 * math.pi, -2.0, 16.0)
+        # cached before the search fills the set
+        self.assertEqual(len(oset), 0)
+
+        ref = ObjectSet(tbl)
+        ref.apply_constraints(0.0, 0.0, 2.0 * math.pi, -2.0, 16.0)
+        ref.populate()
+
+        for packed in (False, True):
+            search = Search(tbl)
+            search.add_comparator("RV", 0, "40") # LT
+            search.add_comparator("RV", 1, "25") # GT
+            search.add_operator(0) # AND
+            self.assertTrue(search.execute(oset, packed=packed) > 0)
+            self.assertEqual(len(oset), len(ref))
+            self.assertTrue(list(oset))
+            search.close()
+
+        ref.close()
+        oset.close()
+        tbl.close()
+
+    def test_search_to_numpy(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy not installed")
+        tbl = self._get_table_safely()
+        search = Search(tbl)
+        oset = ObjectSet(tbl)
+
+        search.add_comparator("RV", 0, "40") # LT
+        search.add_comparator("RV", 1, "25") # GT
+        search.add_operator(0) # AND
+
+        hits = search.execute(oset)
+        arr = search.to_numpy()
+        self.assertEqual(len(arr), hits)
+
+        # rows must match the pointer based iterator
+        for row, obj in zip(arr, search):
+            self.assertEqual(row['ra'], obj.ra)
+            self.assertEqual(row['dec'], obj.dec)
+            self.assertAlmostEqual(row['mag'], obj.mag)
+
+        search.close()
+        oset.close()
+        tbl.close()
+
+    def test_search_packed(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy not installed")
+        tbl = self._get_table_safely()
+        search = Search(tbl)
+        oset = ObjectSet(tbl)
+
+        search.add_comparator("RV", 0, "40") # LT
+        search.add_comparator("RV", 1, "25") # GT
+        search.add_operator(0) # AND
+
+        hits = search.execute(oset)
+        arr = search.to_numpy()
+
+        # packed block must hold the same objects in the same order
+        self.assertEqual(search.execute(oset, packed=True), hits)
+        packed = search.to_numpy()
+        numpy.testing.assert_array_equal(packed['ra'], arr['ra'])
+        numpy.testing.assert_array_equal(packed['dec'], arr['dec'])
+        self.assertEqual([obj.mag for obj in search], packed['mag'].tolist())
+
+        search.close()
+        oset.close()
+        tbl.close()
+
+    def test_search_box(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy not installed")
+        tbl = self._get_table_safely()
+        search = Search(tbl)
+        oset = ObjectSet(tbl)
+
+        search.add_box(10.0 * D2R, 60.0 * D2R, -20.0 * D2R, 20.0 * D2R, 6.0)
+        hits = search.execute(oset)
+        oset.populate()
+
+        # same bounds through the numpy mask must select the same objects
+        expected = oset.filter_numpy(mag_lt=6.0, ra_between=(10.0 * D2R, 60.0 * D2R),
+                                     dec_between=(-20.0 * D2R, 20.0 * D2R))
+        self.assertEqual(hits, len(expected))
+
+        search.close()
+        oset.close()
+        tbl.close()
+
+    def test_search_cone(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest("numpy not installed")
+        tbl = self._get_table_safely()
+        search = Search(tbl)
+        oset = ObjectSet(tbl)
+
+        search.add_cone(30.0 * D2R, 10.0 * D2R, 15.0 * D2R)
+        hits = search.execute(oset)
+        oset.populate()
+
+        # the same cone through the great circle mask
+        expected = oset.filter_numpy(near=(30.0 * D2R, 10.0 * D2R, 15.0 * D2R))
+        self.assertEqual(hits, len(expected))
+
+        search.close()
+        oset.close()
+        tbl.close()
+
     def test_search2(self):
         tbl = self._get_table_safely()
         search = Search(tbl)
@@ -861,6 +861,50 @@ int adb_table_set_constraints(struct adb_object_set *set, double ra, double dec,
 					set->fov, start, end);
 }
 
+/**
+ * \brief Count the objects in a batch of fields.
+ * \ingroup htm
+ *
+ * Applies each ra[i], dec[i], fov[i] constraint in turn, populates the set
+ * and stores its object count in counts[i], so many fields are counted in
+ * one call. The set is left populated for the last field.
+ *
+ * \param set Dataset object set to use
+ * \param num Number of fields
+ * \param ra Field centre right ascensions
+ * \param dec Field centre declinations
+ * \param fov Field radii
+ * \param start Minimum magnitude limit
+ * \param end Maximum magnitude limit
+ * \param counts Returns the object count of each field
+ * \return The number of object heads for the last field, or a negative
+ * error code
+ */
+int adb_table_set_constraints_batch(struct adb_object_set *set, int num,
+									const double *ra, const double *dec,
+									const double *fov, double start,
+									double end, int *counts)
+{
+	int i, ret = 0;
+
+	if (num < 0)
+		return -EINVAL;
+
+	for (i = 0; i < num; i++) {
+		ret = adb_table_set_constraints(set, ra[i], dec[i], fov[i], start, end);
+		if (ret < 0)
+			return ret;
+
+		ret = adb_set_get_objects(set);
+		if (ret < 0)
+			return ret;
+
+		counts[i] = set->count;
+	}
+
+	return ret;
+}
+
 /**
  * \brief Free a dataset object subset allocation.
  * \ingroup htm
@@ -915,6 +959,23 @@ int adb_set_get_count(struct adb_object_set *set)
 	return set->count;
 }
 
+int adb_set_get_trixels(struct adb_object_set *set, struct adb_trixel_id *ids,
+						int max)
+{
+	struct htm_trixel *t;
+	int i;
+
+	for (i = 0; ids != NULL && i < set->valid_trixels && i < max; i++) {
+		t = set->trixels[i];
+		ids[i].hemisphere = t->hemisphere;
+		ids[i].quadrant = t->quadrant;
+		ids[i].depth = t->depth;
+		ids[i].position = t->position;
+	}
+
+	return set->valid_trixels;
+}
+
 /**
  * \brief Retrieve a key-matching index offset mapping to the hash definition arrays.
  *
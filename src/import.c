@@ -19,9 +19,13 @@
 #include <dirent.h>
 #include <errno.h> // IWYU pragma: keep
 #include <math.h>
+#include <stdint.h>
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
+#include <fcntl.h>
+#include <unistd.h>
+#include <sys/mman.h>
 #include <sys/stat.h>
 #include <sys/types.h>
 
@@ -34,6 +38,102 @@
 #include "libastrodb/db.h"
 #include "libastrodb/object.h"
 
+/*
+ * HMS/DMS components to radians. Folded into a single constant so each
+ * grouped RA/DEC field costs one multiply per row rather than a divide and
+ * two multiplies (the compiler won't reassociate these without fast-math).
+ */
+#define DMS_MINS_RAD (D2R / 60.0)
+#define DMS_SECS_RAD (D2R / 3600.0)
+#define HMS_HRS_RAD (15.0 * D2R)
+#define HMS_MINS_RAD (15.0 * D2R / 60.0)
+#define HMS_SECS_RAD (15.0 * D2R / 3600.0)
+
+/*
+ * Fast path for the fixed format decimals found in CDS columns, i.e.
+ * [spaces][sign]digits[.digits]. When the digits fit the mantissa and the
+ * power of ten is also exact, a single IEEE division is correctly rounded
+ * (Clinger's fast path) so the result matches strtod()/strtof(). Anything
+ * else, exponents, long mantissas, nan/inf or no digits, goes to libc.
+ */
+static const double import_pow10[] = {
+	1e0, 1e1, 1e2, 1e3, 1e4, 1e5, 1e6, 1e7,
+	1e8, 1e9, 1e10, 1e11, 1e12, 1e13, 1e14, 1e15,
+};
+
+static const float import_pow10f[] = {
+	1e0f, 1e1f, 1e2f, 1e3f, 1e4f, 1e5f, 1e6f, 1e7f,
+};
+
+static inline const char *import_scan_decimal(const char *p, uint64_t *mant,
+											  int *digits, int *frac,
+											  int *neg)
+{
+	*mant = 0;
+	*digits = *frac = *neg = 0;
+
+	while (*p == ' ')
+		p++;
+
+	if (*p == '-') {
+		*neg = 1;
+		p++;
+	} else if (*p == '+')
+		p++;
+
+	while (*p >= '0' && *p <= '9') {
+		*mant = *mant * 10 + (*p++ - '0');
+		(*digits)++;
+	}
+
+	if (*p == '.') {
+		p++;
+		while (*p >= '0' && *p <= '9') {
+			*mant = *mant * 10 + (*p++ - '0');
+			(*digits)++;
+			(*frac)++;
+		}
+	}
+
+	return p;
+}
+
+static inline double import_strtod(const char *src, char **end)
+{
+	uint64_t mant;
+	int digits, frac, neg;
+	const char *p;
+	double val;
+
+	p = import_scan_decimal(src, &mant, &digits, &frac, &neg);
+
+	/* 10^15 < 2^53 so up to 15 digits are exact in a double */
+	if (unlikely(digits == 0 || digits > 15 || *p == 'e' || *p == 'E'))
+		return strtod(src, end);
+
+	*end = (char *)p;
+	val = (double)mant / import_pow10[frac];
+	return neg ? -val : val;
+}
+
+static inline float import_strtof(const char *src, char **end)
+{
+	uint64_t mant;
+	int digits, frac, neg;
+	const char *p;
+	float val;
+
+	p = import_scan_decimal(src, &mant, &digits, &frac, &neg);
+
+	/* 10^7 < 2^24 so up to 7 digits are exact in a float */
+	if (unlikely(digits == 0 || digits > 7 || *p == 'e' || *p == 'E'))
+		return strtof(src, end);
+
+	*end = (char *)p;
+	val = (float)mant / import_pow10f[frac];
+	return neg ? -val : val;
+}
+
 /* table type import's */
 static int int_import(struct adb_object *object, int offset, char *src)
 {
@@ -61,7 +161,7 @@ static int float_import(struct adb_object *object, int offset, char *src)
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(float *)dest = strtof(src, &ptr);
+	*(float *)dest = import_strtof(src, &ptr);
 
 	if (unlikely(src == ptr)) {
 		*(float *)dest = FP_NAN;
@@ -74,7 +174,7 @@ static int double_import(struct adb_object *object, int offset, char *src)
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(double *)dest = strtod(src, &ptr);
+	*(double *)dest = import_strtod(src, &ptr);
 
 	if (unlikely(src == ptr)) {
 		*(double *)dest = FP_NAN;
@@ -88,7 +188,7 @@ static int double_degrees_import(struct adb_object *object, int offset,
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(double *)dest = strtod(src, &ptr);
+	*(double *)dest = import_strtod(src, &ptr);
 
 	if (unlikely(src == ptr)) {
 		*(double *)dest = FP_NAN;
@@ -114,7 +214,7 @@ static int double_dms_degs(struct adb_object *object, int offset, char *src)
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(double *)dest = strtod(src, &ptr) * D2R;
+	*(double *)dest = import_strtod(src, &ptr) * D2R;
 
 	if (unlikely(src == ptr)) {
 		*(double *)dest = FP_NAN;
@@ -127,7 +227,7 @@ static int double_dms_mins(struct adb_object *object, int offset, char *src)
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(double *)dest += (strtod(src, &ptr) / 60.0) * D2R;
+	*(double *)dest += import_strtod(src, &ptr) * DMS_MINS_RAD;
 
 	if (unlikely(src == ptr))
 		return -1;
@@ -138,7 +238,7 @@ static int double_dms_secs(struct adb_object *object, int offset, char *src)
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(double *)dest += (strtod(src, &ptr) / 3600.0) * D2R;
+	*(double *)dest += import_strtod(src, &ptr) * DMS_SECS_RAD;
 
 	if (unlikely(src == ptr))
 		return -1;
@@ -158,7 +258,7 @@ static int double_hms_hrs(struct adb_object *object, int offset, char *src)
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(double *)dest = (strtod(src, &ptr) * 15.0) * D2R;
+	*(double *)dest = import_strtod(src, &ptr) * HMS_HRS_RAD;
 
 	if (unlikely(src == ptr))
 		return -1;
@@ -169,7 +269,7 @@ static int double_hms_mins(struct adb_object *object, int offset, char *src)
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(double *)dest += ((strtod(src, &ptr) / 60.0) * 15.0) * D2R;
+	*(double *)dest += import_strtod(src, &ptr) * HMS_MINS_RAD;
 
 	if (unlikely(src == ptr))
 		return -1;
@@ -180,7 +280,7 @@ static int double_hms_secs(struct adb_object *object, int offset, char *src)
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(double *)dest += ((strtod(src, &ptr) / 3600.0) * 15.0) * D2R;
+	*(double *)dest += import_strtod(src, &ptr) * HMS_SECS_RAD;
 
 	if (unlikely(src == ptr))
 		return -1;
@@ -192,11 +292,11 @@ static int float_alt_import(struct adb_object *object, int offset, char *src,
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(float *)dest = strtof(src, &ptr);
+	*(float *)dest = import_strtof(src, &ptr);
 
 	/* is primary source invalid then try alternate source */
 	if (src == ptr) {
-		*(float *)dest = strtof(src2, &ptr);
+		*(float *)dest = import_strtof(src2, &ptr);
 		if (unlikely(src2 == ptr)) {
 			*(float *)dest = FP_NAN;
 			return -1;
@@ -210,11 +310,11 @@ static int double_alt_import(struct adb_object *object, int offset, char *src,
 {
 	char *ptr, *dest = (char *)object + offset;
 
-	*(double *)dest = strtod(src, &ptr);
+	*(double *)dest = import_strtod(src, &ptr);
 
 	/* is primary source invalid then try alternate source */
 	if (src == ptr) {
-		*(double *)dest = strtod(src2, &ptr);
+		*(double *)dest = import_strtod(src2, &ptr);
 		if (unlikely(src2 == ptr)) {
 			*(double *)dest = FP_NAN;
 			return -1;
@@ -963,6 +1063,51 @@ out:
 	return count;
 }
 
+/*
+ * Open a catalogue data file for import. The file is mapped and read back
+ * through fmemopen() so the histogram and row passes are served from the
+ * page cache mapping rather than a read() syscall per stdio buffer. Falls
+ * back to plain stdio if the file can't be mapped.
+ */
+static FILE *import_open(const char *path, void **map, size_t *map_size)
+{
+	struct stat st;
+	FILE *f;
+	int fd;
+
+	*map = NULL;
+	*map_size = 0;
+
+	fd = open(path, O_RDONLY);
+	if (fd < 0)
+		return NULL;
+
+	if (fstat(fd, &st) == 0 && st.st_size > 0) {
+		*map = mmap(NULL, st.st_size, PROT_READ, MAP_PRIVATE, fd, 0);
+		if (*map == MAP_FAILED) {
+			*map = NULL;
+		} else {
+			*map_size = st.st_size;
+			madvise(*map, *map_size, MADV_SEQUENTIAL);
+
+			f = fmemopen(*map, *map_size, "r");
+			if (f != NULL) {
+				close(fd);
+				return f;
+			}
+
+			munmap(*map, *map_size);
+			*map = NULL;
+			*map_size = 0;
+		}
+	}
+
+	f = fdopen(fd, "r");
+	if (f == NULL)
+		close(fd);
+	return f;
+}
+
 /**
  * @brief Import an ASCII dataset into the table object array.
  *
@@ -980,6 +1125,8 @@ int table_import(struct adb_db *db, int table_id, char *file)
 	struct adb_table *table;
 	FILE *f;
 	char file_path[ADB_PATH_SIZE];
+	void *map;
+	size_t map_size;
 	int ret;
 
 	table = &db->table[table_id];
@@ -995,7 +1142,7 @@ int table_import(struct adb_db *db, int table_id, char *file)
 	}
 
 	/* open data file */
-	f = fopen(file_path, "r");
+	f = import_open(file_path, &map, &map_size);
 	if (f == NULL) {
 		adb_debug(db, ADB_LOG_CDS_IMPORT, "failed to open file %s\n", file_path);
 		return -EIO;
@@ -1027,6 +1174,8 @@ int table_import(struct adb_db *db, int table_id, char *file)
 
 out:
 	fclose(f);
+	if (map)
+		munmap(map, map_size);
 	return ret;
 }
 
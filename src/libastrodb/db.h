@@ -224,6 +224,17 @@ int adb_table_get_count(struct adb_db *db, int table_id);
  */
 int adb_table_get_object_size(struct adb_db *db, int table_id);
 
+/**
+ * \brief Get the contiguous array holding every loaded object of a table
+ * \ingroup dataset
+ * \param db Reference to Database context
+ * \param table_id The identifier target structure
+ * \param objects Returns the first object, rows are object size bytes apart
+ * \return number of objects or negative error code
+ */
+int adb_table_get_objects(struct adb_db *db, int table_id,
+						  const void **objects);
+
 #ifdef __cplusplus
 }
 #endif
@@ -138,6 +138,24 @@ struct adb_object_set *adb_table_set_new(struct adb_db *db, int table_id);
 int adb_table_set_constraints(struct adb_object_set *set, double ra, double dec,
 							  double fov, double min_Z, double max_Z);
 
+/**
+ * \brief Apply a batch of constraints and count the objects in each
+ * \ingroup dataset
+ * \param set The targeted dataset to constrain
+ * \param num Number of fields in the ra, dec, fov and counts arrays
+ * \param ra Right Ascension of each field centre
+ * \param dec Declination of each field centre
+ * \param fov Field of View radius of each field
+ * \param min_Z Minimum Z or magnitude limit for filtering
+ * \param max_Z Maximum Z or magnitude limit for filtering
+ * \param counts Returns the number of objects in each field
+ * \return object heads of the last field, or an error code
+ */
+int adb_table_set_constraints_batch(struct adb_object_set *set, int num,
+									const double *ra, const double *dec,
+									const double *fov, double min_Z,
+									double max_Z, int *counts);
+
 /**
  * \brief Frees an active dataset and any associated memory
  * \ingroup dataset
@@ -186,6 +204,17 @@ struct adb_object_head {
 	unsigned int count; /*!< count indicating the size of the objects array */
 };
 
+/*! \struct adb_trixel_id
+ * \brief Identifies one HTM trixel of an object set's clipped cover
+ * \ingroup dataset
+ */
+struct adb_trixel_id {
+	unsigned int hemisphere; /*!< 0 north, 1 south */
+	unsigned int quadrant; /*!< quadrant of the hemisphere */
+	unsigned int depth; /*!< HTM depth */
+	unsigned int position; /*!< position index at depth */
+};
+
 /**
  * \brief Evaluate and populate the underlying objects in a constrained dataset
  * \ingroup dataset
@@ -267,6 +296,22 @@ struct adb_object_head *adb_set_get_head(struct adb_object_set *set);
  */
 int adb_set_get_count(struct adb_object_set *set);
 
+/**
+ * \brief Get the HTM trixels covering a populated object set
+ * \ingroup dataset
+ *
+ * Copies the identity of up to max trixels selected by the set's clip into
+ * ids. Call with ids NULL to only get the count. The cover is valid after
+ * adb_set_get_objects() and changes with adb_table_set_constraints().
+ *
+ * \param set The populated object set
+ * \param ids Array to fill, or NULL
+ * \param max Size of ids
+ * \return Number of trixels in the cover
+ */
+int adb_set_get_trixels(struct adb_object_set *set, struct adb_trixel_id *ids,
+						int max);
+
 #ifdef __cplusplus
 };
 #endif
@@ -57,6 +57,35 @@ enum adb_comparator {
 	ADB_COMP_NE /*!< Not equal to comparator (!=) */
 };
 
+/*! \struct adb_search_box
+ * \brief Position and magnitude bounds for adb_search_add_box()
+ * \ingroup search
+ *
+ * RA and DEC bounds are in radians and are exclusive. A NaN mag_max
+ * disables the magnitude test.
+ */
+struct adb_search_box {
+	double ra_min; /*!< Lower RA bound (radians) */
+	double ra_max; /*!< Upper RA bound (radians) */
+	double dec_min; /*!< Lower DEC bound (radians) */
+	double dec_max; /*!< Upper DEC bound (radians) */
+	float mag_max; /*!< Upper magnitude bound, NaN for none */
+};
+
+/*! \struct adb_search_term
+ * \brief One RPN term for adb_search_add_terms()
+ * \ingroup search
+ *
+ * A term with a field is a comparator (field, comp, value), a term with a
+ * NULL field is the operator op.
+ */
+struct adb_search_term {
+	const char *field; /*!< Field symbol, NULL for an operator term */
+	enum adb_comparator comp; /*!< Comparator for a field term */
+	const char *value; /*!< Comparator value for a field term */
+	enum adb_operator op; /*!< Operator for an operator term */
+};
+
 /*! \typedef adb_custom_comparator
  * \brief A custom object search comparator function pointer type
  * \ingroup search
@@ -130,6 +159,57 @@ int adb_search_add_operator(struct adb_search *search, enum adb_operator op);
 int adb_search_add_comparator(struct adb_search *search, const char *field,
 							  enum adb_comparator comp, const char *value);
 
+/**
+ * \brief Add a sequence of RPN terms to the search
+ * \ingroup search
+ *
+ * Pushes each term in order as adb_search_add_comparator() or
+ * adb_search_add_operator() would, so a whole search expression can be
+ * built in one call. On error the terms before the failing one stay on
+ * the search.
+ *
+ * \param search The search context
+ * \param terms Array of terms in RPN order
+ * \param count Number of terms
+ * \return 0 on success, or an error code
+ */
+int adb_search_add_terms(struct adb_search *search,
+						 const struct adb_search_term *terms, int count);
+
+/**
+ * \brief Add a position and magnitude box (in RPN) to the search
+ * \ingroup search
+ *
+ * Pushes RA, DEC and optional magnitude comparators on the object
+ * position and joins them with an AND operator in a single call. This is
+ * equivalent to the add_comparator()/add_operator() sequence for the same
+ * bounds and can be combined with further RPN terms.
+ *
+ * \param search The search context
+ * \param box The bounds to apply
+ * \return 0 on success, or an error code
+ */
+int adb_search_add_box(struct adb_search *search,
+					   const struct adb_search_box *box);
+
+/**
+ * \brief Add a position cone (in RPN) to the search
+ * \ingroup search
+ *
+ * Pushes a test matching objects within radius of the given position and
+ * joins it with an AND operator. The centre unit vector and cos(radius)
+ * are precomputed so objects are matched by a DEC range check and a dot
+ * product, with no inverse trig per object.
+ *
+ * \param search The search context
+ * \param ra Cone centre RA in radians
+ * \param dec Cone centre DEC in radians
+ * \param radius Cone radius in radians
+ * \return 0 on success, or an error code
+ */
+int adb_search_add_cone(struct adb_search *search, double ra, double dec,
+						double radius);
+
 /**
  * \brief Add a custom comparator callback (in RPN) to the search
  * \ingroup search
@@ -160,6 +240,24 @@ int adb_search_get_results(struct adb_search *search,
 						   struct adb_object_set *set,
 						   const struct adb_object **objects[]);
 
+/**
+ * \brief Execute a search query and copy the results into one block
+ * \ingroup search
+ *
+ * As adb_search_get_results() but the matching objects are copied into a
+ * contiguous buffer owned by the search, one table object size apart. The
+ * buffer stays valid until the next search execution or adb_search_free().
+ *
+ * \param search The search context containing the compiled query
+ * \param set The target object set containing candidate objects to query against
+ * \param objects Set to the start of the packed result objects
+ * \param count Set to the number of packed result objects
+ * \return The number of results (hits) found, or a negative error code
+ */
+int adb_search_get_results_packed(struct adb_search *search,
+								  struct adb_object_set *set,
+								  const void **objects, int *count);
+
 /**
  * \brief Get the total number of search hits (successful matches)
  * \ingroup search
@@ -17,6 +17,8 @@
  */
 
 #include <errno.h>
+#include <math.h>
+#include <stddef.h>
 #include <stdlib.h>
 #include <string.h>
 
@@ -76,6 +78,9 @@ struct adb_search {
 	int search_test_count; /*!< number of search nodes */
 
 	const struct adb_object **objects; /*!< search result objects */
+
+	void *packed; /*!< contiguous copy of result objects */
+	size_t packed_bytes; /*!< allocated size of packed */
 };
 
 /* compares <data> with <value> using <comparator_t> */
@@ -524,6 +529,7 @@ static inline void free_branch(struct adb_search_branch *branch)
 void adb_search_free(struct adb_search *search)
 {
 	free(search->objects);
+	free(search->packed);
 	free_branch(search->start_branch);
 	free(search);
 }
@@ -733,6 +739,194 @@ err:
 	return -ENOMEM;
 }
 
+/* push a comparator test on a struct offset with an already typed value */
+static int search_add_value_test(struct adb_search *search, int offset,
+								 comparator_t compare, const void *value,
+								 size_t size)
+{
+	struct adb_search_branch *test;
+
+	if (search->test_orphan_count >= ADB_SRCH_MAX_BRANCH_TESTS)
+		return -EINVAL;
+
+	test = calloc(1, sizeof(struct adb_search_branch));
+	if (test == NULL)
+		return -ENOMEM;
+
+	test->value = malloc(size);
+	if (test->value == NULL) {
+		free(test);
+		return -ENOMEM;
+	}
+	memcpy(test->value, value, size);
+
+	test->offset = offset;
+	test->compare = compare;
+
+	search->test_orphan[search->test_orphan_count++] = test;
+	search->search_test_count++;
+	search->start_branch = NULL;
+	return 0;
+}
+
+/**
+ * \brief Add a sequence of RPN terms to the search.
+ *
+ * Each term with a field is added as a comparator and each term without
+ * one as an operator, in array order.
+ *
+ * \param search Search context
+ * \param terms Array of terms in RPN order
+ * \param count Number of terms
+ * \return 0 on success, or a negative error code on failure
+ */
+int adb_search_add_terms(struct adb_search *search,
+						 const struct adb_search_term *terms, int count)
+{
+	int i, ret;
+
+	if (terms == NULL || count < 0)
+		return -EINVAL;
+
+	for (i = 0; i < count; i++) {
+		if (terms[i].field != NULL)
+			ret = adb_search_add_comparator(search, terms[i].field,
+											terms[i].comp, terms[i].value);
+		else
+			ret = adb_search_add_operator(search, terms[i].op);
+		if (ret < 0)
+			return ret;
+	}
+
+	return 0;
+}
+
+/**
+ * \brief Add a position and magnitude box to the search.
+ *
+ * Pushes exclusive RA and DEC range tests on the object position, and a
+ * magnitude upper bound unless box->mag_max is NaN, then joins them with
+ * an AND operator. Values are taken as already converted so no field
+ * lookups or string parsing are done.
+ *
+ * \param search Search context
+ * \param box Position (radians) and magnitude bounds
+ * \return 0 on success, or a negative error code on failure
+ */
+int adb_search_add_box(struct adb_search *search,
+					   const struct adb_search_box *box)
+{
+	int ret;
+
+	if (box == NULL)
+		return -EINVAL;
+
+	ret = search_add_value_test(search, offsetof(struct adb_object, ra),
+								double_gt_comp, &box->ra_min, sizeof(double));
+	if (ret < 0)
+		return ret;
+	ret = search_add_value_test(search, offsetof(struct adb_object, ra),
+								double_lt_comp, &box->ra_max, sizeof(double));
+	if (ret < 0)
+		return ret;
+	ret = search_add_value_test(search, offsetof(struct adb_object, dec),
+								double_gt_comp, &box->dec_min, sizeof(double));
+	if (ret < 0)
+		return ret;
+	ret = search_add_value_test(search, offsetof(struct adb_object, dec),
+								double_lt_comp, &box->dec_max, sizeof(double));
+	if (ret < 0)
+		return ret;
+
+	if (!isnan(box->mag_max)) {
+		ret = search_add_value_test(search, offsetof(struct adb_object, mag),
+									float_lt_comp, &box->mag_max,
+									sizeof(float));
+		if (ret < 0)
+			return ret;
+	}
+
+	adb_debug(search->db, ADB_LOG_SEARCH,
+			  "new box RA %f:%f DEC %f:%f mag < %f\n", box->ra_min,
+			  box->ra_max, box->dec_min, box->dec_max, box->mag_max);
+
+	return adb_search_add_operator(search, ADB_OP_AND);
+}
+
+/* cone test value, the centre unit vector and radius are worked out once */
+struct search_cone {
+	double x, y, z; /*!< centre unit vector */
+	double cos_radius; /*!< cosine of the cone radius */
+	double dec_min, dec_max; /*!< DEC bounds of the cone */
+};
+
+/**
+ * \brief Internal comparator for the cone test.
+ *
+ * The DEC bounds reject most objects without any trig, the rest are
+ * tested by the dot product of their unit vector with the cone centre.
+ *
+ * \param data Pointer to the object RA, followed by DEC.
+ * \param value Pointer to the struct search_cone.
+ * \return 1 if the object is inside the cone, 0 otherwise.
+ */
+static int cone_comp(void *data, void *value)
+{
+	const struct search_cone *cone = value;
+	const double *pos = data;
+	double cos_dec;
+
+	if (pos[1] < cone->dec_min || pos[1] > cone->dec_max)
+		return 0;
+
+	cos_dec = cos(pos[1]);
+	return cos_dec * cos(pos[0]) * cone->x + cos_dec * sin(pos[0]) * cone->y +
+			   sin(pos[1]) * cone->z >=
+		   cone->cos_radius;
+}
+
+/**
+ * \brief Add a position cone to the search.
+ *
+ * Pushes a single test that matches objects within radius of the RA, DEC
+ * centre and joins it with an AND operator. The centre unit vector and
+ * cos(radius) are computed here so each object only costs a DEC range
+ * check and, inside that range, a dot product.
+ *
+ * \param search Search context
+ * \param ra Cone centre RA (radians)
+ * \param dec Cone centre DEC (radians)
+ * \param radius Cone radius (radians)
+ * \return 0 on success, or a negative error code on failure
+ */
+int adb_search_add_cone(struct adb_search *search, double ra, double dec,
+						double radius)
+{
+	struct search_cone cone;
+	int ret;
+
+	if (radius < 0.0 || isnan(radius))
+		return -EINVAL;
+
+	cone.x = cos(dec) * cos(ra);
+	cone.y = cos(dec) * sin(ra);
+	cone.z = sin(dec);
+	cone.cos_radius = cos(radius);
+	cone.dec_min = dec - radius;
+	cone.dec_max = dec + radius;
+
+	/* ra and dec are adjacent in struct adb_object */
+	ret = search_add_value_test(search, offsetof(struct adb_object, ra),
+								cone_comp, &cone, sizeof(cone));
+	if (ret < 0)
+		return ret;
+
+	adb_debug(search->db, ADB_LOG_SEARCH,
+			  "new cone RA %f DEC %f radius %f\n", ra, dec, radius);
+
+	return adb_search_add_operator(search, ADB_OP_AND);
+}
+
 /**
  * \brief Add a custom comparator function to the search.
  *
@@ -826,6 +1020,57 @@ int adb_search_get_results(struct adb_search *search,
 	return search->hit_count;
 }
 
+/**
+ * \brief Execute the search and copy matching objects into one block.
+ *
+ * Runs the search as adb_search_get_results() and then copies each hit
+ * into a contiguous buffer owned by the search, table object size bytes
+ * apart. This lets callers read the results as a single array rather than
+ * chasing one pointer per hit. The buffer is valid until the next search
+ * execution or adb_search_free().
+ *
+ * \param search Configured search context
+ * \param set The object dataset boundary to iterate through
+ * \param objects Set to the packed result objects
+ * \param count Set to the number of packed objects
+ * \return The number of matching hit objects, or a negative error code
+ */
+int adb_search_get_results_packed(struct adb_search *search,
+								  struct adb_object_set *set,
+								  const void **objects, int *count)
+{
+	const struct adb_object **hits;
+	size_t bytes = search->table->object.bytes;
+	char *dest;
+	void *packed;
+	int i, n;
+
+	*objects = NULL;
+	*count = 0;
+
+	n = adb_search_get_results(search, set, &hits);
+	if (n <= 0)
+		return n;
+
+	if (n * bytes > search->packed_bytes) {
+		packed = realloc(search->packed, n * bytes);
+		if (packed == NULL)
+			return -ENOMEM;
+		search->packed = packed;
+		search->packed_bytes = n * bytes;
+	}
+
+	dest = search->packed;
+	for (i = 0; i < n; i++) {
+		memcpy(dest, hits[i], bytes);
+		dest += bytes;
+	}
+
+	*objects = search->packed;
+	*count = n;
+	return n;
+}
+
 /**
  * \brief Get the number of successful search hits.
  *
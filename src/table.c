@@ -470,6 +470,36 @@ int adb_table_get_object_size(struct adb_db *db, int table_id)
 	return table->object.bytes;
 }
 
+/**
+ * \brief Get the table's object array.
+ *
+ * All loaded objects live in one contiguous array of
+ * adb_table_get_object_size() byte rows, ordered by trixel. Object set
+ * heads point into this array, so callers can walk every row without
+ * copying. The array is owned by the table and freed by adb_table_close().
+ *
+ * \param db Database catalog
+ * \param table_id Table ID to query
+ * \param objects Returns the first object
+ * \return Number of objects, -EINVAL for an invalid table ID or -ENODATA
+ * if the table has no objects loaded
+ */
+int adb_table_get_objects(struct adb_db *db, int table_id,
+						  const void **objects)
+{
+	struct adb_table *table;
+
+	if (table_id < 0 || table_id >= ADB_MAX_TABLES)
+		return -EINVAL;
+
+	table = &db->table[table_id];
+	if (table->objects == NULL)
+		return -ENODATA;
+
+	*objects = table->objects;
+	return table->object.count;
+}
+
 /**
  * \brief Create a hashmap index for a specified text-based key.
  *